@@ -1,3 +1,4 @@
+import re
 from os import getenv
 from time import time
 from dotenv import load_dotenv
@@ -11,10 +12,13 @@ except Exception as e:
 
 # Validate essential environment variables after loading .env
 
-# Check for BOT_TOKEN existence and format (should contain exactly one colon)
+# Numeric bot id, one colon, then the secret part issued by @BotFather
+_BOT_TOKEN_RE = re.compile(r"^\d+:[A-Za-z0-9_-]{30,}$")
+
+# Check for BOT_TOKEN existence and format
 bot_token = getenv("BOT_TOKEN")
-if not bot_token or bot_token.count(":") != 1:
-    print("Error: BOT_TOKEN must be in format '123456:abcdefghijklmnopqrstuvwxyz'")
+if not bot_token or not _BOT_TOKEN_RE.match(bot_token):
+    print("Error: BOT_TOKEN must be in format '123456:ABC-DEF1234ghIkl-zyx57W2v1u123ew11'")
     exit(1)
 
 # Check for a valid SESSION_STRING - must not be missing or a placeholder string
@@ -38,3 +42,28 @@ class PyroConf(object):
 
     # Timestamp marking when the bot started (epoch time)
     BOT_START_TIME = time()
+
+    # Forwarding defaults, used until /forward saves a runtime config
+    SOURCE_CHANNELS = getenv("SOURCE_CHANNELS", "")
+    DESTINATION_CHANNEL = getenv("DESTINATION_CHANNEL", "")
+    FORWARD_ENABLED = getenv("FORWARD_ENABLED", "false").lower() == "true"
+
+    # Run on uvloop when installed; set USE_UVLOOP=0 to keep the stock asyncio loop
+    USE_UVLOOP = getenv("USE_UVLOOP", "1") == "1"
+
+    # Channel cloning: copies in flight at once and API calls per second
+    CLONE_CONCURRENCY = int(getenv("CLONE_CONCURRENCY", "20"))
+    CLONE_RATE = float(getenv("CLONE_RATE", "30"))
+    # Sends per second into any one target chat; defaults to CLONE_RATE
+    CLONE_CHAT_RATE = float(getenv("CLONE_CHAT_RATE", str(CLONE_RATE)))
+    # Protected media: parallel downloads and uploads in the reupload pipeline
+    CLONE_DOWNLOAD_WORKERS = int(getenv("CLONE_DOWNLOAD_WORKERS", "4"))
+    CLONE_UPLOAD_WORKERS = int(getenv("CLONE_UPLOAD_WORKERS", "4"))
+    # Protected media up to this size (MB) is relayed through memory instead of disk.
+    # Every buffer holds a pipeline slot until it is sent, so cloning keeps at most
+    # this times (CLONE_DOWNLOAD_WORKERS + CLONE_UPLOAD_WORKERS) in RAM
+    IN_MEMORY_MAX_MB = int(getenv("IN_MEMORY_MAX_MB", "50"))
+    # Parallel file transfers per Pyrogram client; by default enough for both pipeline stages
+    MAX_CONCURRENT_TRANSMISSIONS = int(
+        getenv("MAX_CONCURRENT_TRANSMISSIONS", str(max(CLONE_DOWNLOAD_WORKERS, CLONE_UPLOAD_WORKERS)))
+    )
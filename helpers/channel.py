@@ -1,22 +1,179 @@
 import os
+import re
+import json
 import asyncio
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from time import time
 from types import SimpleNamespace
-from typing import Optional, Dict, Callable, Union
-from pyrogram import Client
-from pyrogram.types import Message
+from typing import Any, Optional, Dict, Callable, Awaitable, List, Tuple, Union
+from pyrogram import Client, raw
+from pyrogram.enums import ChatType, MessageMediaType
+from pyrogram.types import Message, User, InputMediaPhoto, InputMediaVideo, InputMediaDocument
 from pyrogram.errors import (
     UsernameNotOccupied,
     PeerIdInvalid,
     ChannelPrivate,
     BadRequest,
+    ChatForwardsRestricted,
     FloodWait,
 )
 
 from logger import LOGGER
-from helpers.files import MAX_FILE_SIZE_BYTES, PREMIUM_MAX_FILE_SIZE_BYTES
+from helpers.files import (
+    MAX_FILE_SIZE_BYTES,
+    PREMIUM_MAX_FILE_SIZE_BYTES,
+    IN_MEMORY_MAX_BYTES,
+    get_media_size,
+)
 from pyleaves import Leaves
 from helpers.utils import progressArgs
+from helpers.ratelimit import TokenBucket, backoff_delay
+
+# Upper bound on ids accepted by a single messages.getMessages request
+FETCH_BATCH_SIZE = 200
+# messages.getHistory returns at most this many messages per call
+HISTORY_PAGE_SIZE = 100
+# messages.forwardMessages accepts at most this many ids per call
+COPY_BATCH_SIZE = 100
+# Attempts per message before a FloodWait counts as a failure
+FLOODWAIT_RETRIES = 5
+# get_channel_info results are reused for this many seconds, for at most this many chats
+CHAT_CACHE_TTL = 300
+CHAT_CACHE_SIZE = 256
+# Seconds before the cached get_me() result is refreshed
+ME_CACHE_TTL = 3600
+# Clone progress is written to disk after this many newly copied messages
+CLONE_STATE_FLUSH_EVERY = 100
+
+_CHAT_TYPE_LABELS = {
+    ChatType.CHANNEL: "Channel",
+    ChatType.GROUP: "Group",
+    ChatType.SUPERGROUP: "Group",
+    ChatType.PRIVATE: "Private",
+    ChatType.BOT: "Bot",
+}
+# Message.media -> (attr, whether the upload takes the converted file); each maps
+# to Client.send_<attr>(<attr>=file). Anything else is sent as a document.
+_UPLOAD_METHODS = {
+    MessageMediaType.PHOTO: ("photo", True),
+    MessageMediaType.VIDEO: ("video", True),
+    MessageMediaType.DOCUMENT: ("document", False),
+    MessageMediaType.STICKER: ("sticker", False),
+    MessageMediaType.VIDEO_NOTE: ("video_note", False),
+    MessageMediaType.ANIMATION: ("animation", False),
+}
+_SKIPPED_MEDIA = frozenset((MessageMediaType.AUDIO, MessageMediaType.VOICE))
+
+
+def _needs_disk_conversion(msg: Message) -> bool:
+    """Non-mp4 videos go through ffmpeg, which needs a real file."""
+    video = getattr(msg, "video", None)
+    return bool(video) and getattr(video, "mime_type", None) != "video/mp4"
+
+
+# "@name" or a t.me link with or without scheme/www (last path segment);
+# invite links (t.me/+... and t.me/joinchat/...) are left whole
+_IDENT_RE = re.compile(
+    r"^(?:@|(?:https?://)?(?:www\.)?t\.me/(?!\+|joinchat/)(?:[^/]*/)*)?(?P<ident>[^/]+)/*$"
+)
+
+
+@lru_cache(maxsize=512)
+def _normalize_channel_identifier(channel_str: str) -> Union[str, int]:
+    """Normalize channel identifier by removing prefixes and extracting from URLs."""
+    channel = channel_str.strip()
+    match = _IDENT_RE.match(channel)
+    if match:
+        channel = match.group("ident")
+    try:
+        return int(channel)
+    except ValueError:
+        return channel
+
+
+def _nothing_to_copy(msg: Optional[Message]) -> bool:
+    """
+    True for messages _copy_single_message would skip anyway: missing, empty,
+    service, audio/voice, or without any content. Filtering them in the producer
+    keeps them from holding a worker or spending a rate-limit token, and counts
+    them as skipped rather than failed.
+    """
+    if not msg or getattr(msg, "id", None) is None or getattr(msg, "empty", False) or getattr(msg, "service", None):
+        return True
+    kind = msg.media
+    if kind in _SKIPPED_MEDIA:
+        return True
+    return not kind and not (msg.text or msg.caption)
+
+
+def _fits_in_memory(msg: Message, limit: int = IN_MEMORY_MAX_BYTES) -> bool:
+    """Media up to ``limit`` bytes that needs no ffmpeg pass can be relayed through a BytesIO."""
+    size = get_media_size(msg)
+    return size is not None and size <= limit and not _needs_disk_conversion(msg)
+
+
+def _discard(scratch: str, paths: List[str]) -> None:
+    """Remove a scratch directory plus any stray files written outside it."""
+    shutil.rmtree(scratch, ignore_errors=True)
+    for path in paths:
+        if path.startswith(scratch):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as cleanup_err:
+            LOGGER(__name__).warning(f"Cleanup failed: {cleanup_err}")
+
+
+def _clone_state_path(src: Union[str, int], dst: Union[str, int]) -> str:
+    return f".clone_state_{src}_{dst}.json"
+
+
+def _load_clone_state(path: str) -> set:
+    """Message ids already copied by an earlier run of the same clone."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return set(json.load(f))
+    except FileNotFoundError:
+        return set()
+    except (OSError, ValueError, TypeError) as e:
+        LOGGER(__name__).warning(f"Ignoring unreadable clone state {path}: {e}")
+        return set()
+
+
+def _save_clone_state(path: str, done: List[int]) -> None:
+    # Write then rename so an interrupted flush never leaves a truncated file;
+    # a unique temp name keeps overlapping flushes from sharing one
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=f"{path}.", suffix=".tmp", dir=".")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(done, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        LOGGER(__name__).warning(f"Could not save clone state {path}: {e}")
+
+
+def _discard_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _chunked(iterable, size: int):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class ChannelCloner:
@@ -25,50 +182,111 @@ class ChannelCloner:
     Supports downloading from protected/restricted channels.
     """
 
-    def __init__(self, user_client: Client, bot_client: Client, *, delay: float = 1.0):
+    def __init__(
+        self,
+        user_client: Client,
+        bot_client: Client,
+        *,
+        concurrency: int = 20,
+        rate: float = 30.0,
+        chat_rate: Optional[float] = None,
+        download_concurrency: int = 4,
+        upload_concurrency: int = 4,
+        in_memory_max_bytes: int = IN_MEMORY_MAX_BYTES,
+    ):
         self.user = user_client
         self.bot = bot_client
-        self.delay = max(0.5, delay)
+        self.concurrency = max(1, concurrency)
+        # Shared across all clone jobs so parallel workers respect one API budget
+        self._bucket = TokenBucket(rate)
+        # Flood limits are also enforced per chat: each clone target gets its own
+        # bucket, so a flooded target slows down without stalling the others
+        self._chat_rate = chat_rate or rate
+        self._chat_buckets: Dict[Union[str, int], TokenBucket] = {}
+        # (fetched_at, info) from get_channel_info keyed by normalized identifier, LRU order
+        self._chat_cache: OrderedDict = OrderedDict()
+        # Source chat id -> has_protected_content, so media skips a copy that can't succeed
+        self._protected: Dict[Union[str, int], bool] = {}
+        # Album copies keyed by (source, group, target): [future, members seen so far].
+        # An entry lives until every album member has taken its result
+        self._group_copies: Dict[tuple, list] = {}
+        # Reupload path runs as a two-stage pipeline: downloads and uploads have
+        # their own slots so the next download overlaps the previous upload
+        self._download_sem = asyncio.Semaphore(download_concurrency)
+        self._upload_sem = asyncio.Semaphore(upload_concurrency)
+        self._staging = asyncio.Semaphore(download_concurrency + upload_concurrency)
+        # Reuploads up to this size stay in memory; larger ones land in
+        # per-message subdirectories of one scratch root
+        self._in_memory_max = in_memory_max_bytes
+        self._scratch = tempfile.mkdtemp(prefix="rdt_clone_")
+        # Scratch cleanup gets its own threads so slow disks never queue behind
+        # the default executor that pyrogram uses for file I/O
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cloner-io")
+        # get_me() result reused for size limits; premium status rarely changes
+        self._me: Optional[User] = None
+        self._me_ts: float = 0.0
+
+    def close(self) -> None:
+        """Stop the cleanup threads and remove the scratch root."""
+        self._io_pool.shutdown(wait=True)
+        shutil.rmtree(self._scratch, ignore_errors=True)
+
+    def _chat_bucket(self, chat: Union[str, int]) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat)
+        if bucket is None:
+            bucket = self._chat_buckets[chat] = TokenBucket(self._chat_rate)
+        return bucket
+
+    async def _run_io(self, func: Callable, *args):
+        """Run blocking filesystem work on the cloner's own thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+
+    async def _get_me_cached(self) -> User:
+        """Return the user account, refreshing it at most once per ME_CACHE_TTL."""
+        if self._me is None or time() - self._me_ts > ME_CACHE_TTL:
+            # Client.start() already fetched the account; seed from it before asking again
+            seeded = getattr(self.user, "me", None) if self._me is None else None
+            self._me = seeded or await self.user.get_me()
+            self._me_ts = time()
+        return self._me
 
     async def get_channel_info(self, channel_identifier: str) -> Optional[Dict]:
         """Get information about a channel by username, ID, or t.me link."""
-        ident: Union[str, int] = channel_identifier.strip()
-        if isinstance(ident, str):
-            if ident.startswith("https://t.me/+"):
-                pass
-            elif ident.startswith("@"):
-                ident = ident[1:]
-            elif ident.startswith("https://t.me/"):
-                ident = ident.rstrip("/").rsplit("/", 1)[-1]
-            
-            try:
-                if ident.replace("-", "").isdigit():
-                    ident = int(ident)
-            except Exception:
-                pass
+        ident = _normalize_channel_identifier(channel_identifier)
+
+        key = str(ident)
+        cached = self._chat_cache.get(key)
+        if cached is not None:
+            cached_at, cached_info = cached
+            if time() - cached_at < CHAT_CACHE_TTL:
+                self._chat_cache.move_to_end(key)
+                return cached_info
+            del self._chat_cache[key]
 
         try:
             chat = await self.user.get_chat(ident)
-            chat_type = str(chat.type)
-            if hasattr(chat, 'type'):
-                if 'channel' in chat_type.lower():
-                    type_description = "Channel"
-                elif 'group' in chat_type.lower() or 'supergroup' in chat_type.lower():
-                    type_description = "Group"
-                else:
-                    type_description = chat_type.title()
-            else:
-                type_description = "Chat"
+            chat_type = chat.type.name.title() if chat.type else "Unknown"
+            type_description = _CHAT_TYPE_LABELS.get(chat.type, "Chat")
 
-            return {
-                "id": getattr(chat, "id", None),
-                "title": getattr(chat, "title", None) or getattr(chat, "first_name", None) or str(getattr(chat, "id", "Unknown")),
-                "username": getattr(chat, "username", None),
+            info = {
+                "id": chat.id,
+                "title": chat.title or chat.first_name or str(chat.id),
+                "username": chat.username,
                 "type": chat_type,
                 "type_description": type_description,
-                "members_count": getattr(chat, "members_count", None),
-                "is_private": not bool(getattr(chat, "username", None)),
+                "members_count": chat.members_count,
+                "is_private": not chat.username,
+                "has_protected_content": bool(chat.has_protected_content),
             }
+            entry = (time(), info)
+            self._chat_cache[key] = entry
+            # Also index by numeric id so a later lookup by id or by username shares one fetch
+            if info["id"] is not None:
+                self._chat_cache[str(info["id"])] = entry
+            while len(self._chat_cache) > CHAT_CACHE_SIZE:
+                self._chat_cache.popitem(last=False)
+            self._protected[info["id"]] = info["has_protected_content"]
+            return info
         except (UsernameNotOccupied, PeerIdInvalid, ChannelPrivate, BadRequest) as e:
             LOGGER(__name__).error(f"Cannot access channel '{channel_identifier}': {e}")
             return None
@@ -84,72 +302,418 @@ class ChannelCloner:
         end_id: Optional[int] = None,
         progress_callback: Optional[Callable] = None,
         progress_message: Optional[Message] = None,
+        progress_interval: float = 3.0,
+        limit: Optional[int] = None,
     ) -> Dict[str, int]:
-        """Clone messages from source channel to target channel."""
-        src = self._normalize_channel_identifier(source_channel)
-        dst = self._normalize_channel_identifier(target_channel)
+        """
+        Clone messages from source channel to target channel.
+
+        Without a range the whole history is cloned newest-first; ``limit`` caps
+        that at the newest ``limit`` messages and stops paging once they are read.
+
+        ``progress_callback(current_id, start_id, end_id, stats)`` is invoked
+        by a background reporter every ``progress_interval`` seconds with the
+        most recently finished id. It receives the live ``stats`` dict rather
+        than a copy, so no per-call allocation is made; callbacks must treat
+        it as read-only.
+
+        Copied ids are recorded in ``.clone_state_<src>_<dst>.json`` so an
+        interrupted clone can be re-run and skips what already made it across.
+        The file is removed once a run finishes without failures.
+        """
+        # Reject a bad range before any chat lookup, worker or reporter is started
+        if start_id is not None and end_id is not None and start_id > end_id:
+            raise ValueError("start_id cannot be greater than end_id")
+
+        src = await self._resolve_chat_id(source_channel)
+        dst = await self._resolve_chat_id(target_channel)
         stats = {"successful": 0, "failed": 0, "skipped": 0, "total": 0}
+        state_path = _clone_state_path(src, dst)
+        done = await self._run_io(_load_clone_state, state_path)
+        unsaved = {"count": 0}
+        if done:
+            LOGGER(__name__).info(f"Resuming clone {src} -> {dst}: {len(done)} messages already copied")
+        # Bounded so the producer blocks once workers fall behind
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        last = {"id": start_id}
+        stop = asyncio.Event()
+        reporter = None
+        if progress_callback:
+            reporter = asyncio.create_task(
+                self._report_loop(
+                    progress_callback,
+                    lambda: (last["id"], start_id, end_id, stats),
+                    stop,
+                    progress_interval,
+                )
+            )
 
-        if start_id is None or end_id is None:
-            LOGGER(__name__).info(f"Starting full channel clone from {src} to {dst}")
-            async for msg in self.user.get_chat_history(src):
-                current_id = getattr(msg, "id", None)
-                if current_id is None:
-                    stats["skipped"] += 1
-                    continue
+        dst_bucket = self._chat_bucket(dst)
+
+        async def _worker() -> None:
+            while True:
+                mid, source_msg = await queue.get()
+                try:
+                    await self._bucket.acquire()
+                    await dst_bucket.acquire()
+                    ok = await self._copy_single_message(
+                        src, dst, mid, progress_message, source_msg=source_msg
+                    )
+                except Exception as e:
+                    LOGGER(__name__).error(f"Worker error on {src}/{mid}: {type(e).__name__} - {e}")
+                    ok = False
 
-                ok = await self._copy_single_message(src, dst, current_id, progress_message)
                 stats["total"] += 1
                 if ok:
                     stats["successful"] += 1
+                    self._bucket.reward()
+                    dst_bucket.reward()
+                    await _mark_done([mid])
                 else:
                     stats["failed"] += 1
+                last["id"] = mid
+                queue.task_done()
 
-                if progress_callback:
-                    try:
-                        await progress_callback(current_id, start_id or current_id, end_id or current_id, stats)
-                    except Exception:
-                        pass
+        # The io pool has several threads; one save at a time keeps an older
+        # snapshot from landing after a newer one
+        state_lock = asyncio.Lock()
 
-                await asyncio.sleep(self.delay)
-        else:
-            if start_id > end_id:
-                raise ValueError("start_id cannot be greater than end_id")
+        async def _save_state() -> None:
+            async with state_lock:
+                await self._run_io(_save_clone_state, state_path, list(done))
+
+        async def _mark_done(ids: List[int]) -> None:
+            done.update(ids)
+            unsaved["count"] += len(ids)
+            if unsaved["count"] >= CLONE_STATE_FLUSH_EVERY:
+                unsaved["count"] = 0
+                await _save_state()
 
-            LOGGER(__name__).info(f"Starting range clone from {src} to {dst}: {start_id}-{end_id}")
-            for mid in range(start_id, end_id + 1):
-                ok = await self._copy_single_message(src, dst, mid, progress_message)
+        def _skip(msg: Message) -> bool:
+            # _nothing_to_copy first: it is what copes with a missing (None) message
+            if _nothing_to_copy(msg) or msg.id in done:
+                stats["skipped"] += 1
                 stats["total"] += 1
-                if ok:
-                    stats["successful"] += 1
-                else:
-                    stats["failed"] += 1
+                return True
+            return False
 
-                if progress_callback:
-                    try:
-                        await progress_callback(mid, start_id, end_id, stats)
-                    except Exception:
-                        pass
+        async def _copy_run(run: List[Message]) -> bool:
+            """Bulk-copy consecutive messages; a failed batch queues what it had left."""
+            chunks = _chunked(run, COPY_BATCH_SIZE)
+            for chunk in chunks:
+                if not await self._copy_bulk(src, dst, chunk):
+                    for rest in (chunk, *chunks):
+                        for msg in rest:
+                            await queue.put((msg.id, msg))
+                    return False
+                ids = [msg.id for msg in chunk]
+                stats["total"] += len(ids)
+                stats["successful"] += len(ids)
+                last["id"] = ids[-1]
+                await _mark_done(ids)
+            return True
+
+        async def _dispatch(msgs: List[Message]) -> None:
+            # Plain file media from an unprotected source is copied 100 ids per call;
+            # only what that can't handle goes to the workers one by one. Runs go
+            # out in page order but do not wait for the workers, so a queued
+            # message may still land after the run that follows it.
+            bulk_ok = not self._protected.get(src, False)
+            run: List[Message] = []
+            for msg in msgs:
+                if _skip(msg):
+                    continue
+                if bulk_ok and self._bulk_copyable(msg):
+                    run.append(msg)
+                    continue
+                if run:
+                    bulk_ok = await _copy_run(run)
+                    run = []
+                await queue.put((msg.id, msg))
+            if run:
+                await _copy_run(run)
+
+        # A short range needs no more workers than it has messages
+        n_workers = self.concurrency
+        if start_id is not None and end_id is not None:
+            n_workers = min(n_workers, end_id - start_id + 1)
+        workers = [asyncio.create_task(_worker()) for _ in range(n_workers)]
+        prefetch = None
+        pages = None
+        finished = False
+
+        try:
+            if start_id is None or end_id is None:
+                LOGGER(__name__).info(f"Starting full channel clone from {src} to {dst}")
+                # History pages already carry full messages; hand them straight on
+                pages = self._history_pages(src, limit)
+                async for page in pages:
+                    await _dispatch(page)
+            else:
+                LOGGER(__name__).info(f"Starting range clone from {src} to {dst}: {start_id}-{end_id}")
+                chunks = _chunked(range(start_id, end_id + 1), FETCH_BATCH_SIZE)
+                first = next(chunks, None)
+                prefetch = asyncio.create_task(self._fetch_batch(src, first)) if first else None
+                while prefetch:
+                    batch = await prefetch
+                    # Request the next batch now so its round-trip overlaps queueing this one
+                    upcoming = next(chunks, None)
+                    prefetch = asyncio.create_task(self._fetch_batch(src, upcoming)) if upcoming else None
+                    await _dispatch(batch)
 
-                await asyncio.sleep(self.delay)
+            await queue.join()
+            finished = True
+        finally:
+            if prefetch:
+                prefetch.cancel()
+            if pages:
+                await pages.aclose()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Members this job skipped never collect their album result; drop the
+            # finished entries for this pair and leave in-flight ones to their waiters
+            stale = [
+                key for key, (future, _) in self._group_copies.items()
+                if future.done() and key[0] == src and key[2] == dst
+            ]
+            for key in stale:
+                del self._group_copies[key]
+            if finished and not stats["failed"]:
+                async with state_lock:
+                    await self._run_io(_discard_file, state_path)
+            elif unsaved["count"]:
+                await _save_state()
+            stop.set()
+            if reporter:
+                await reporter
 
         return stats
 
-    def _normalize_channel_identifier(self, channel_str: str) -> Union[str, int]:
-        """Normalize channel identifier by removing prefixes and extracting from URLs."""
-        channel: Union[str, int] = channel_str.strip()
-        if isinstance(channel, str):
-            if channel.startswith("@"):
-                channel = channel[1:]
-            elif channel.startswith("https://t.me/") and not channel.startswith("https://t.me/+"):
-                channel = channel.rstrip("/").rsplit("/", 1)[-1]
-            
-            if channel.replace("-", "").isdigit():
-                try:
-                    channel = int(channel)
-                except Exception:
-                    pass
-        return channel
+    @staticmethod
+    async def _report_loop(
+        callback: Callable[..., Awaitable],
+        snapshot: Callable[[], tuple],
+        stop: asyncio.Event,
+        interval: float,
+    ) -> None:
+        """
+        Invoke ``callback(*snapshot())`` every ``interval`` seconds until ``stop`` is set,
+        plus once more on stop. Ticks where nothing moved are skipped: callbacks
+        typically edit a Telegram message, and an identical edit is a wasted request
+        that Telegram rejects anyway.
+        """
+        reported = None
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            current_id, start_id, end_id, stats = snapshot()
+            if current_id is None:
+                continue
+            state = (current_id, tuple(stats.values()))
+            if state == reported:
+                continue
+            reported = state
+            try:
+                await callback(current_id, start_id or current_id, end_id or current_id, stats)
+            except Exception:
+                pass
+
+    async def _resolve_chat_id(self, channel_identifier: str) -> Union[str, int]:
+        """
+        Resolve an identifier to its numeric chat id via the cached get_channel_info,
+        so per-message calls skip username resolution. Falls back to the normalized form.
+        """
+        info = await self.get_channel_info(channel_identifier)
+        if info and info.get("id") is not None:
+            return info["id"]
+        return _normalize_channel_identifier(channel_identifier)
+
+    async def _paced(self, what: str, call: Callable[[], Awaitable]):
+        """
+        Run ``call()`` under the shared bucket, sitting out FloodWaits.
+
+        A FloodWait penalizes and drains the bucket for the server's wait, then
+        the call is retried with growing jitter, up to FLOODWAIT_RETRIES times.
+        """
+        for attempt in range(FLOODWAIT_RETRIES):
+            await self._bucket.acquire()
+            try:
+                return await call()
+            except FloodWait as e:
+                if attempt + 1 >= FLOODWAIT_RETRIES:
+                    raise
+                wait_s = int(getattr(e, "value", 1))
+                LOGGER(__name__).warning(f"FloodWait {wait_s}s on {what}, sleeping...")
+                self._bucket.penalize()
+                self._bucket.drain(wait_s)
+                await asyncio.sleep(backoff_delay(0, attempt))
+
+    async def _fetch_batch(self, source_channel: Union[str, int], message_ids: List[int]) -> List[Message]:
+        """Fetch up to FETCH_BATCH_SIZE messages in a single round-trip."""
+        result = await self._paced(
+            "batch fetch",
+            lambda: self.user.get_messages(chat_id=source_channel, message_ids=message_ids),
+        )
+        if not isinstance(result, list):
+            result = [result]
+        return result
+
+    async def _fetch_history_page(self, source_channel: Union[str, int], offset_id: int) -> List[Message]:
+        """Fetch one history page of messages older than ``offset_id`` (0 = newest)."""
+
+        async def _page() -> List[Message]:
+            return [
+                msg async for msg in self.user.get_chat_history(
+                    source_channel, limit=HISTORY_PAGE_SIZE, offset_id=offset_id
+                )
+            ]
+
+        return await self._paced("history page", _page)
+
+    async def _get_message(self, source_channel: Union[str, int], message_id: int) -> Optional[Message]:
+        """
+        Fetch one message for callers that were not handed it; clone ranges go
+        through _fetch_batch instead. Deleted ids come back as None.
+        """
+        await self._bucket.acquire()
+        result = await self.user.get_messages(chat_id=source_channel, message_ids=message_id)
+        if isinstance(result, list):
+            result = result[0] if result else None
+        if result is None or getattr(result, "empty", False):
+            return None
+        return result
+
+    async def _history_pages(self, source_channel: Union[str, int], limit: Optional[int] = None):
+        """
+        Yield the channel history newest-first, one page at a time, stopping
+        after ``limit`` messages if given.
+
+        The next page is requested as soon as the current one arrives, so its
+        round-trip overlaps with the caller queueing the current page.
+        """
+        remaining = limit
+        pending = asyncio.create_task(self._fetch_history_page(source_channel, 0))
+        try:
+            while True:
+                page = await pending
+                pending = None
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                if not page:
+                    return
+                if remaining is None or remaining > 0:
+                    pending = asyncio.create_task(self._fetch_history_page(source_channel, page[-1].id))
+                yield page
+                if pending is None:
+                    return
+        finally:
+            if pending:
+                pending.cancel()
+
+    async def _send_poll(self, source_msg: Message, target_channel: Union[str, int]) -> Optional[Message]:
+        poll = source_msg.poll
+        # Safely get poll question
+        question = getattr(poll, "question", None)
+        if not question:
+            LOGGER(__name__).error(f"Poll has no question for {source_msg.chat.id}/{source_msg.id}")
+            return None
+
+        poll_option_texts = []
+        options = getattr(poll, "options", [])
+        for option in options:
+            if isinstance(option, str):
+                poll_option_texts.append(option)
+            elif isinstance(option, dict) and "text" in option:
+                poll_option_texts.append(str(option["text"]))
+            elif hasattr(option, "text"):
+                poll_option_texts.append(str(option.text))
+            else:
+                poll_option_texts.append(str(option))
+
+        if not poll_option_texts or len(poll_option_texts) < 2:
+            LOGGER(__name__).error(f"Invalid poll options for {source_msg.chat.id}/{source_msg.id}")
+            return None
+
+        # Safely get all poll attributes with defaults
+        poll_kwargs = {
+            "chat_id": target_channel,
+            "question": question,
+            "options": poll_option_texts,
+            "is_anonymous": getattr(poll, "is_anonymous", True),
+            "allows_multiple_answers": getattr(poll, "allows_multiple_answers", False),
+            "type": getattr(poll, "type", "regular"),
+            "correct_option_id": getattr(poll, "correct_option_id", None),
+            "explanation": getattr(poll, "explanation", None),
+            "open_period": getattr(poll, "open_period", None),
+            "close_date": getattr(poll, "close_date", None),
+            "is_closed": getattr(poll, "is_closed", False),
+        }
+
+        try:
+            return await self.user.send_poll(**poll_kwargs)
+        except AttributeError as e:
+            if "has no attribute 'text'" not in str(e):
+                raise
+            poll_kwargs["options"] = [SimpleNamespace(text=t, entities=[]) for t in poll_option_texts]
+            return await self.user.send_poll(**poll_kwargs)
+
+    async def _send_contact(self, source_msg: Message, target_channel: Union[str, int]) -> Message:
+        contact = source_msg.contact
+        return await self.user.send_contact(
+            chat_id=target_channel,
+            phone_number=contact.phone_number,
+            first_name=contact.first_name,
+            last_name=getattr(contact, "last_name", ""),
+            vcard=getattr(contact, "vcard", None)
+        )
+
+    async def _send_location(self, source_msg: Message, target_channel: Union[str, int]) -> Message:
+        return await self.user.send_location(
+            chat_id=target_channel,
+            latitude=source_msg.location.latitude,
+            longitude=source_msg.location.longitude
+        )
+
+    async def _send_venue(self, source_msg: Message, target_channel: Union[str, int]) -> Message:
+        venue = source_msg.venue
+        return await self.user.send_venue(
+            chat_id=target_channel,
+            latitude=venue.location.latitude,
+            longitude=venue.location.longitude,
+            title=venue.title,
+            address=venue.address,
+            foursquare_id=getattr(venue, "foursquare_id", None),
+            foursquare_type=getattr(venue, "foursquare_type", None)
+        )
+
+    async def _send_dice(self, source_msg: Message, target_channel: Union[str, int]) -> Message:
+        return await self.user.send_dice(chat_id=target_channel, emoji=source_msg.dice.emoji)
+
+    async def _send_text(self, source_msg: Message, target_channel: Union[str, int]) -> Message:
+        # Without media there was no link preview on the source either
+        if source_msg.text:
+            text, entities = source_msg.text, source_msg.entities
+        else:
+            text, entities = source_msg.caption, source_msg.caption_entities
+        return await self.user.send_message(
+            chat_id=target_channel,
+            text=text,
+            entities=entities,
+            disable_web_page_preview=True,
+        )
+
+    # Non-file media rebuilt through a dedicated send_* call, keyed by Message.media
+    _HANDLERS: Dict[MessageMediaType, Callable[..., Awaitable[Optional[Message]]]] = {
+        MessageMediaType.POLL: _send_poll,
+        MessageMediaType.CONTACT: _send_contact,
+        MessageMediaType.LOCATION: _send_location,
+        MessageMediaType.VENUE: _send_venue,
+        MessageMediaType.DICE: _send_dice,
+    }
 
     async def _copy_single_message(
         self, 
@@ -157,254 +721,395 @@ class ChannelCloner:
         target_channel: Union[str, int], 
         message_id: int, 
         progress_message: Optional[Message] = None,
-        return_message_id: bool = False
+        return_message_id: bool = False,
+        source_msg: Optional[Message] = None,
+        retry_count: int = 0,
     ) -> bool:
-        """Copy a single message from source to target, handling protected content."""
+        """
+        Copy a single message from source to target, handling protected content.
+        Pass an already-fetched ``source_msg`` to skip the get_messages round-trip.
+        """
         try:
-            result = await self.user.get_messages(chat_id=source_channel, message_ids=message_id)
-            
-            if isinstance(result, list):
-                source_msg = result[0] if result else None
-            else:
-                source_msg = result
+            if source_msg is None:
+                source_msg = await self._get_message(source_channel, message_id)
 
             if not source_msg:
-                return False
+                return None if return_message_id else False
+
+            # Classify once from the media enum instead of probing each attribute
+            kind = source_msg.media
 
-            # Skip audio and voice messages
-            if source_msg.audio or source_msg.voice:
+            if not kind:
+                # Text-only is the common case in most channels; settle it first
+                if not (source_msg.text or source_msg.caption):
+                    LOGGER(__name__).info(f"Skipping empty message {source_channel}/{message_id}")
+                    return None if return_message_id else False
+                handler = ChannelCloner._send_text
+            elif kind in _SKIPPED_MEDIA:
                 LOGGER(__name__).info(f"Skipping audio/voice message {source_channel}/{message_id}")
                 return None if return_message_id else False
+            else:
+                # Polls, contacts, locations, venues and dice are rebuilt via their send_* call
+                handler = self._HANDLERS.get(kind)
 
-            # BULLETPROOF Poll handling
-            if getattr(source_msg, "poll", None):
-                poll = source_msg.poll
+            if handler is not None:
                 try:
-                    # Safely get poll question
-                    question = getattr(poll, "question", None)
-                    if not question:
-                        LOGGER(__name__).error(f"Poll has no question for {source_channel}/{message_id}")
-                        return None if return_message_id else False
-                    
-                    poll_option_texts = []
-                    options = getattr(poll, "options", [])
-                    for option in options:
-                        if isinstance(option, str):
-                            poll_option_texts.append(option)
-                        elif isinstance(option, dict) and "text" in option:
-                            poll_option_texts.append(str(option["text"]))
-                        elif hasattr(option, "text"):
-                            poll_option_texts.append(str(option.text))
-                        else:
-                            poll_option_texts.append(str(option))
-                    
-                    if not poll_option_texts or len(poll_option_texts) < 2:
-                        LOGGER(__name__).error(f"Invalid poll options for {source_channel}/{message_id}")
-                        return None if return_message_id else False
-
-                    # Safely get all poll attributes with defaults
-                    poll_kwargs = {
-                        "chat_id": target_channel,
-                        "question": question,
-                        "options": poll_option_texts,
-                        "is_anonymous": getattr(poll, "is_anonymous", True),
-                        "allows_multiple_answers": getattr(poll, "allows_multiple_answers", False),
-                        "type": getattr(poll, "type", "regular"),
-                        "correct_option_id": getattr(poll, "correct_option_id", None),
-                        "explanation": getattr(poll, "explanation", None),
-                        "open_period": getattr(poll, "open_period", None),
-                        "close_date": getattr(poll, "close_date", None),
-                        "is_closed": getattr(poll, "is_closed", False),
-                    }
-                    
-                    try:
-                        sent = await self.user.send_poll(**poll_kwargs)
-                    except AttributeError as e:
-                        if "has no attribute 'text'" in str(e):
-                            poll_kwargs["options"] = [SimpleNamespace(text=t, entities=[]) for t in poll_option_texts]
-                            sent = await self.user.send_poll(**poll_kwargs)
-                        else:
-                            raise
-
-                    LOGGER(__name__).info(f"✅ Cloned poll '{question}' ({len(poll_option_texts)} options)")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception as poll_err:
+                    sent = await handler(self, source_msg, target_channel)
+                except FloodWait:
+                    raise
+                except Exception as send_err:
                     LOGGER(__name__).error(
-                        f"Failed to clone poll {source_channel}/{message_id}: {type(poll_err).__name__} - {poll_err}",
+                        f"Failed to clone {source_channel}/{message_id}: {type(send_err).__name__} - {send_err}",
                         exc_info=True,
                     )
                     return None if return_message_id else False
-
-            # Contacts
-            if getattr(source_msg, "contact", None):
-                try:
-                    sent = await self.user.send_contact(
-                        chat_id=target_channel,
-                        phone_number=source_msg.contact.phone_number,
-                        first_name=source_msg.contact.first_name,
-                        last_name=getattr(source_msg.contact, "last_name", ""),
-                        vcard=getattr(source_msg.contact, "vcard", None)
-                    )
-                    LOGGER(__name__).info(f"Copied contact {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
+                if sent is None:
                     return None if return_message_id else False
+                LOGGER(__name__).info(f"Copied {handler.__name__[6:]} {source_channel}/{message_id}")
+                if return_message_id:
+                    return getattr(sent, "id", None)
+                return True
 
-            # Locations
-            if getattr(source_msg, "location", None):
+            # Everything else is file media - copy server-side unless the source forbids it
+            protected = getattr(source_msg, "has_protected_content", False) or self._protected.get(source_channel, False)
+            if not protected:
                 try:
-                    sent = await self.user.send_location(
-                        chat_id=target_channel,
-                        latitude=source_msg.location.latitude,
-                        longitude=source_msg.location.longitude
+                    return await self._copy_server_side(
+                        source_channel,
+                        target_channel,
+                        source_msg,
+                        return_message_id=return_message_id,
                     )
-                    LOGGER(__name__).info(f"Copied location {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
-                    return None if return_message_id else False
-
-            # Venues
-            if getattr(source_msg, "venue", None):
-                try:
-                    sent = await self.user.send_venue(
-                        chat_id=target_channel,
-                        latitude=source_msg.venue.location.latitude,
-                        longitude=source_msg.venue.location.longitude,
-                        title=source_msg.venue.title,
-                        address=source_msg.venue.address,
-                        foursquare_id=getattr(source_msg.venue, "foursquare_id", None),
-                        foursquare_type=getattr(source_msg.venue, "foursquare_type", None)
+                except ChatForwardsRestricted:
+                    # Remember it so the rest of the source skips the doomed copy attempt
+                    self._protected[source_channel] = True
+                except BadRequest as copy_err:
+                    LOGGER(__name__).warning(
+                        f"Server-side copy failed for {source_channel}/{message_id} ({copy_err}), re-uploading"
                     )
-                    LOGGER(__name__).info(f"Copied venue {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
-                    return None if return_message_id else False
 
-            # Dice
-            if getattr(source_msg, "dice", None):
-                try:
-                    sent = await self.user.send_dice(
-                        chat_id=target_channel,
-                        emoji=source_msg.dice.emoji
-                    )
-                    LOGGER(__name__).info(f"Copied dice {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
-                    return None if return_message_id else False
-
-            # Text-only messages
-            if source_msg.text and not source_msg.media:
-                try:
-                    sent = await self.user.send_message(chat_id=target_channel, text=source_msg.text)
-                    LOGGER(__name__).info(f"Copied text {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
-                    return None if return_message_id else False
-
-            # Caption-only messages
-            if source_msg.caption and not source_msg.media:
-                try:
-                    sent = await self.user.send_message(chat_id=target_channel, text=source_msg.caption)
-                    LOGGER(__name__).info(f"Copied caption {source_channel}/{message_id}")
-                    if return_message_id:
-                        return getattr(sent, "id", None)
-                    return True
-                except Exception:
-                    return None if return_message_id else False
-
-            # Media messages - ALWAYS download and reupload for protected channels
-            if source_msg.media:
-                LOGGER(__name__).info(f"Processing media message {source_channel}/{message_id}")
-                return await self._download_and_reupload(
-                    source_channel,
-                    target_channel,
-                    message_id,
-                    progress_message,
-                    return_message_id=return_message_id,
+            # Protected channels - download and reupload
+            LOGGER(__name__).info(f"Processing protected media message {source_channel}/{message_id}")
+            if getattr(source_msg, "media_group_id", None):
+                sent_id, _ = await self._once_per_album(
+                    # Separate key from the server-side copy of the same album
+                    (source_channel, source_msg.media_group_id, target_channel, "reupload"),
+                    lambda: self._download_and_reupload_album(source_channel, target_channel, source_msg),
+                    members=lambda result: result[1],
                 )
-
-            # Empty message
-            LOGGER(__name__).info(f"Skipping empty message {source_channel}/{message_id}")
-            return None if return_message_id else False
+                if return_message_id:
+                    return sent_id
+                return sent_id is not None
+            return await self._download_and_reupload(
+                source_channel,
+                target_channel,
+                message_id,
+                progress_message,
+                return_message_id=return_message_id,
+                source_msg=source_msg,
+                kind=kind,
+            )
 
         except FloodWait as e:
             wait_s = int(getattr(e, "value", 1))
-            LOGGER(__name__).warning(f"FloodWait {wait_s}s, sleeping...")
-            await asyncio.sleep(wait_s + 1)
-            try:
-                return await self._copy_single_message(
-                    source_channel,
-                    target_channel,
-                    message_id,
-                    progress_message,
-                    return_message_id=return_message_id,
-                )
-            except Exception:
+            # Slow every worker down and make everyone writing to this target sit
+            # out the wait together; without a target bucket (mirroring) that is everyone
+            self._bucket.penalize()
+            bucket = self._chat_buckets.get(target_channel, self._bucket)
+            if bucket is not self._bucket:
+                bucket.penalize()
+            bucket.drain(wait_s)
+            if retry_count + 1 >= FLOODWAIT_RETRIES:
+                LOGGER(__name__).error(f"FloodWait retries exhausted for {source_channel}/{message_id}")
                 return None if return_message_id else False
+            LOGGER(__name__).warning(f"FloodWait {wait_s}s on {source_channel}/{message_id}, sleeping...")
+            # The drained bucket covers the wait itself; growing jitter on top backs
+            # off repeat offenders and keeps retries from queueing in lockstep
+            await asyncio.sleep(backoff_delay(0, retry_count))
+            await bucket.acquire()
+            return await self._copy_single_message(
+                source_channel,
+                target_channel,
+                message_id,
+                progress_message,
+                return_message_id=return_message_id,
+                source_msg=source_msg,
+                retry_count=retry_count + 1,
+            )
         except Exception as e:
             LOGGER(__name__).error(f"Error copying {source_channel}/{message_id}: {type(e).__name__}")
             return None if return_message_id else False
 
+    def _bulk_copyable(self, msg: Message) -> bool:
+        """File media a plain server-side copy reproduces; albums keep copy_media_group."""
+        kind = msg.media
+        return bool(
+            kind
+            and kind not in _SKIPPED_MEDIA
+            and kind not in self._HANDLERS
+            and not msg.media_group_id
+            and not msg.has_protected_content
+        )
+
+    async def _copy_bulk(
+        self,
+        source_channel: Union[str, int],
+        target_channel: Union[str, int],
+        msgs: List[Message],
+    ) -> bool:
+        """
+        Copy up to COPY_BATCH_SIZE messages with one messages.forwardMessages call.
+
+        ``drop_author`` makes the forward a copy, exactly what copy_message does per
+        id. Returns False when the batch must take the per-message path instead.
+        """
+        ids = [msg.id for msg in msgs]
+        try:
+            from_peer = await self.user.resolve_peer(source_channel)
+            to_peer = await self.user.resolve_peer(target_channel)
+            await self._chat_bucket(target_channel).acquire()
+            await self._paced(
+                "bulk copy",
+                lambda: self.user.invoke(
+                    raw.functions.messages.ForwardMessages(
+                        from_peer=from_peer,
+                        id=ids,
+                        random_id=[self.user.rnd_id() for _ in ids],
+                        to_peer=to_peer,
+                        drop_author=True,
+                    )
+                ),
+            )
+        except ChatForwardsRestricted:
+            self._protected[source_channel] = True
+            return False
+        except (BadRequest, FloodWait) as e:
+            LOGGER(__name__).warning(
+                f"Bulk copy of {len(ids)} messages from {source_channel} failed ({e}), copying one by one"
+            )
+            return False
+        LOGGER(__name__).info(f"Copied {len(ids)} messages {source_channel}/{ids[0]}-{ids[-1]}")
+        return True
+
+    async def _once_per_album(
+        self,
+        key: tuple,
+        factory: Callable[[], Awaitable],
+        members: Callable[[Any], int],
+    ):
+        """
+        Run ``factory`` once per album key; other members await the same result.
+
+        The entry is dropped once ``members(result)`` callers have taken the
+        result, and straight away if the call failed, so a FloodWait retry
+        really calls Telegram again instead of replaying the old exception.
+        """
+        entry = self._group_copies.get(key)
+        if entry is None:
+            entry = self._group_copies[key] = [asyncio.ensure_future(factory()), 0]
+        future = entry[0]
+        entry[1] += 1
+        try:
+            # Shield so a cancelled member does not abort the album for the others
+            result = await asyncio.shield(future)
+        except BaseException:
+            if future.done() and self._group_copies.get(key) is entry:
+                del self._group_copies[key]
+            raise
+        if entry[1] >= members(result) and self._group_copies.get(key) is entry:
+            del self._group_copies[key]
+        return result
+
+    async def _copy_server_side(
+        self,
+        source_channel: Union[str, int],
+        target_channel: Union[str, int],
+        source_msg: Message,
+        return_message_id: bool = False,
+    ):
+        """
+        Copy media by file_id so Telegram moves the bytes server-side.
+        Albums are copied once with copy_media_group; every member of the
+        album shares that single call.
+        """
+        message_id = source_msg.id
+        group_id = getattr(source_msg, "media_group_id", None)
+        if group_id:
+            sent_msgs = await self._once_per_album(
+                (source_channel, group_id, target_channel),
+                lambda: self.user.copy_media_group(
+                    chat_id=target_channel,
+                    from_chat_id=source_channel,
+                    message_id=message_id,
+                ),
+                # One copy comes back per source member; audio/voice members
+                # are skipped before they get here, so they never collect it
+                members=lambda sent: sum(1 for m in sent or () if m.media not in _SKIPPED_MEDIA),
+            )
+            sent = sent_msgs[0] if sent_msgs else None
+            LOGGER(__name__).info(f"Copied album member {source_channel}/{message_id}")
+        else:
+            sent = await source_msg.copy(target_channel)
+            LOGGER(__name__).info(f"Copied media {source_channel}/{message_id}")
+
+        if return_message_id:
+            return getattr(sent, "id", None)
+        return sent is not None
+
+    async def _convert_for_upload(self, source_msg: Message, media_path: str) -> str:
+        """
+        Normalize non-mp4 videos to mp4; fall back to the original file.
+        Photos are left alone: send_photo re-encodes them to JPEG server-side,
+        so a PNG pass would only cost time.
+        """
+        if not source_msg.video or media_path.lower().endswith(".mp4"):
+            return media_path
+
+        from helpers.convert import ensure_mp4
+
+        try:
+            return await ensure_mp4(media_path)
+        except Exception as conv_err:
+            LOGGER(__name__).warning(f"Conversion failed, using original: {conv_err}")
+        return media_path
+
+    async def _upload_media(
+        self,
+        target_channel: Union[str, int],
+        source_msg: Message,
+        media_path: str,
+        converted_path: str,
+        **kwargs,
+    ) -> Optional[Message]:
+        """Send a downloaded file with the send_* method matching the source media type."""
+        attr, uses_converted = _UPLOAD_METHODS.get(source_msg.media, ("document", False))
+        send = getattr(self.user, f"send_{attr}")
+        file = converted_path if uses_converted else media_path
+        return await send(chat_id=target_channel, **{attr: file}, **kwargs)
+
+    async def _download_and_reupload_album(
+        self,
+        source_channel: Union[str, int],
+        target_channel: Union[str, int],
+        source_msg: Message,
+    ) -> Tuple[Optional[int], int]:
+        """
+        Download every item of a protected album concurrently and re-upload it.
+        Returns the id of the first uploaded message (None if nothing was sent)
+        and how many members reach this call (audio/voice are skipped earlier),
+        which tells _once_per_album when every one has taken the result.
+        """
+        await self._bucket.acquire()
+        album = await self.user.get_media_group(source_channel, source_msg.id)
+        items = [m for m in album if m.media and m.media not in _SKIPPED_MEDIA]
+
+        # One scratch dir per album so cleanup is a single rmtree
+        scratch = await self._run_io(tempfile.mkdtemp, None, f"album_{source_msg.media_group_id}_", self._scratch)
+
+        # Buffers live until send_media_group, so each one holds a staging slot
+        # like a single reupload does. With no slot free the item goes to disk
+        # instead of waiting, since the slots it would wait on may be this album's.
+        staged = 0
+
+        async def _fetch(msg: Message):
+            nonlocal staged
+            if _fits_in_memory(msg, self._in_memory_max) and not self._staging.locked():
+                await self._staging.acquire()
+                staged += 1
+                async with self._download_sem:
+                    return await msg.download(in_memory=True)
+            async with self._download_sem:
+                return await msg.download(file_name=f"{scratch}/")
+
+        converted_paths = []
+        try:
+            LOGGER(__name__).info(f"📥 Downloading album {source_channel}/{source_msg.id} ({len(items)} items)...")
+            paths = await asyncio.gather(*[_fetch(m) for m in items], return_exceptions=True)
+
+            ready = []
+            for msg, path in zip(items, paths):
+                if isinstance(path, BaseException) or not path:
+                    LOGGER(__name__).error(f"Download failed: {source_channel}/{msg.id}: {path}")
+                    continue
+                if not isinstance(path, str):
+                    # In-memory buffer: nothing to convert or clean up
+                    ready.append((msg, path, path))
+                    continue
+                if not await self._run_io(os.path.exists, path):
+                    LOGGER(__name__).error(f"Download failed: {source_channel}/{msg.id}: {path}")
+                    continue
+                converted = await self._convert_for_upload(msg, path)
+                converted_paths.append(converted)
+                ready.append((msg, path, converted))
+
+            if not ready:
+                return None, len(items)
+            if len(ready) == 1:
+                async with self._upload_sem:
+                    await self._bucket.acquire()
+                    sent = await self._upload_media(target_channel, *ready[0])
+                return getattr(sent, "id", None), len(items)
+
+            # One send_media_group call keeps the album intact on the target
+            media = []
+            for msg, path, converted in ready:
+                if msg.media == MessageMediaType.PHOTO:
+                    media.append(InputMediaPhoto(converted))
+                elif msg.media == MessageMediaType.VIDEO:
+                    media.append(InputMediaVideo(converted))
+                else:
+                    media.append(InputMediaDocument(path))
+            async with self._upload_sem:
+                await self._bucket.acquire()
+                sent_msgs = await self.user.send_media_group(chat_id=target_channel, media=media)
+            LOGGER(__name__).info(f"✅ Successfully cloned album {source_channel}/{source_msg.id}")
+            return (getattr(sent_msgs[0], "id", None) if sent_msgs else None), len(items)
+        finally:
+            for _ in range(staged):
+                self._staging.release()
+            await self._run_io(_discard, scratch, converted_paths)
+
     async def _download_and_reupload(
         self, 
         source_channel: Union[str, int], 
         target_channel: Union[str, int], 
         message_id: int, 
         progress_message: Optional[Message] = None,
-        return_message_id: bool = False
+        return_message_id: bool = False,
+        source_msg: Optional[Message] = None,
+        kind: Optional[MessageMediaType] = None,
     ) -> bool:
         """
         Download media from source and re-upload to target.
         Works even with protected/restricted content.
+        Pass an already-fetched ``source_msg`` to skip the get_messages round-trip,
+        and its ``kind`` (``Message.media``) when the caller has already read it.
         """
         try:
-            result = await self.user.get_messages(chat_id=source_channel, message_ids=message_id)
-            
-            if isinstance(result, list):
-                source_msg = result[0] if result else None
-            else:
-                source_msg = result
+            if source_msg is None:
+                source_msg = await self._get_message(source_channel, message_id)
 
             if not source_msg:
                 LOGGER(__name__).warning(f"Message not found: {source_channel}/{message_id}")
                 return None if return_message_id else False
 
-            # Skip non-media messages
-            if not source_msg.media:
-                LOGGER(__name__).info(f"No media in {source_channel}/{message_id}")
-                return None if return_message_id else False
-
-            # Skip audio and voice
-            if source_msg.audio or source_msg.voice:
-                LOGGER(__name__).info(f"Skipping audio/voice {source_channel}/{message_id}")
+            if kind is None:
+                kind = source_msg.media
+            # Skip non-media messages, audio and voice
+            if not kind or kind in _SKIPPED_MEDIA:
+                LOGGER(__name__).info(f"Nothing to re-upload in {source_channel}/{message_id}")
                 return None if return_message_id else False
 
             # Check file size limits
             try:
-                me = await self.user.get_me()
-                is_premium = bool(getattr(me, "is_premium", False))
+                is_premium = bool(getattr(await self._get_me_cached(), "is_premium", False))
+            except FloodWait:
+                raise
             except Exception:
                 is_premium = False
 
             limit = PREMIUM_MAX_FILE_SIZE_BYTES if is_premium else MAX_FILE_SIZE_BYTES
-            size = None
-
-            if source_msg.document:
-                size = source_msg.document.file_size
-            elif source_msg.video:
-                size = source_msg.video.file_size
+            size = get_media_size(source_msg)
 
             if size is not None and size > limit:
                 LOGGER(__name__).warning(f"File too large: {source_channel}/{message_id} ({size} bytes)")
@@ -413,36 +1118,40 @@ class ChannelCloner:
             media_path = None
             converted_path = None
             start_ts = time()
-            
+            # Small files that need no ffmpeg pass never touch the disk
+            in_memory = _fits_in_memory(source_msg, self._in_memory_max)
+
+            # Hold a staging slot from download until cleanup; this bounds how many
+            # files sit between the download and upload stages. Overlap happens
+            # across messages, not within one: pyrogram's save_file seeks to size
+            # the upload and reads synchronously, so it cannot consume a file
+            # that is still arriving from stream_media.
+            scratch = await self._run_io(tempfile.mkdtemp, None, f"{message_id}_", self._scratch)
+            await self._staging.acquire()
             try:
                 # Download the media (works even from protected channels with user session)
                 LOGGER(__name__).info(f"📥 Downloading media {source_channel}/{message_id}...")
-                if progress_message:
-                    media_path = await source_msg.download(
-                        progress=Leaves.progress_for_pyrogram,
-                        progress_args=progressArgs("📥 Downloading", progress_message, start_ts),
-                    )
-                else:
-                    media_path = await source_msg.download()
+                async with self._download_sem:
+                    if progress_message:
+                        media_path = await source_msg.download(
+                            file_name=f"{scratch}/",
+                            in_memory=in_memory,
+                            progress=Leaves.progress_for_pyrogram,
+                            progress_args=progressArgs("📥 Downloading", progress_message, start_ts),
+                        )
+                    else:
+                        media_path = await source_msg.download(file_name=f"{scratch}/", in_memory=in_memory)
 
-                if not media_path or not os.path.exists(media_path):
+                if not media_path or (not in_memory and not await self._run_io(os.path.exists, media_path)):
                     LOGGER(__name__).error(f"Download failed: {source_channel}/{message_id}")
                     return None if return_message_id else False
 
-                LOGGER(__name__).info(f"Downloaded to: {media_path}")
-
-                # Convert if needed
-                from helpers.convert import ensure_mp4, ensure_png
-
-                converted_path = media_path
-                try:
-                    if source_msg.video:
-                        converted_path = await ensure_mp4(media_path)
-                    elif source_msg.photo:
-                        converted_path = await ensure_png(media_path)
-                except Exception as conv_err:
-                    LOGGER(__name__).warning(f"Conversion failed, using original: {conv_err}")
+                if in_memory:
+                    # _fits_in_memory already ruled out anything needing a transcode
                     converted_path = media_path
+                else:
+                    LOGGER(__name__).info(f"Downloaded to: {media_path}")
+                    converted_path = await self._convert_for_upload(source_msg, media_path)
 
                 # Upload to target
                 kwargs = {}
@@ -453,47 +1162,29 @@ class ChannelCloner:
                     }
 
                 LOGGER(__name__).info(f"📤 Uploading to {target_channel}...")
-                sent = None
-                
-                if source_msg.photo:
-                    sent = await self.user.send_photo(chat_id=target_channel, photo=converted_path, **kwargs)
-                elif source_msg.video:
-                    sent = await self.user.send_video(chat_id=target_channel, video=converted_path, **kwargs)
-                elif source_msg.document:
-                    sent = await self.user.send_document(chat_id=target_channel, document=media_path, **kwargs)
-                elif source_msg.sticker:
-                    sent = await self.user.send_sticker(chat_id=target_channel, sticker=media_path)
-                elif source_msg.video_note:
-                    sent = await self.user.send_video_note(chat_id=target_channel, video_note=media_path)
-                elif source_msg.animation:
-                    sent = await self.user.send_animation(chat_id=target_channel, animation=media_path, **kwargs)
-                else:
-                    sent = await self.user.send_document(chat_id=target_channel, document=media_path, **kwargs)
+                async with self._upload_sem:
+                    await self._bucket.acquire()
+                    sent = await self._upload_media(target_channel, source_msg, media_path, converted_path, **kwargs)
 
                 LOGGER(__name__).info(f"✅ Successfully cloned media {source_channel}/{message_id}")
                 if return_message_id:
                     return getattr(sent, "id", None)
                 return True
 
+            except FloodWait:
+                raise
             except Exception as download_err:
                 LOGGER(__name__).error(f"Download/upload error {source_channel}/{message_id}: {type(download_err).__name__} - {download_err}")
                 return None if return_message_id else False
                 
             finally:
-                # Cleanup downloaded files
-                try:
-                    if media_path and os.path.exists(media_path):
-                        os.remove(media_path)
-                        LOGGER(__name__).debug(f"Cleaned up: {media_path}")
-                except Exception as cleanup_err:
-                    LOGGER(__name__).warning(f"Cleanup failed: {cleanup_err}")
-                
-                try:
-                    if converted_path and converted_path != media_path and os.path.exists(converted_path):
-                        os.remove(converted_path)
-                except Exception:
-                    pass
+                # Cleanup downloaded files off the event loop (in-memory buffers leave nothing behind)
+                stray = [converted_path] if isinstance(converted_path, str) else []
+                await self._run_io(_discard, scratch, stray)
+                self._staging.release()
 
+        except FloodWait:
+            raise
         except Exception as e:
             LOGGER(__name__).error(f"Fatal error in download/reupload {source_channel}/{message_id}: {type(e).__name__}")
             return None if return_message_id else False
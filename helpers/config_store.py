@@ -1,18 +1,36 @@
+import asyncio
+import atexit
+import copy
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from config import PyroConf
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 CONFIG_PATH = "runtime_config.json"
+# Mutations within this many seconds of each other share one disk write
+FLUSH_DELAY = 0.1
+
+# Parsed config, read from disk once; load_config() hands out copies. Source
+# channels and per-source mirror targets are held as dicts with None values:
+# ordered sets with O(1) membership, turned back into lists on the way out.
+_CACHE: Optional[Dict] = None
+_flush_handle: Optional[asyncio.TimerHandle] = None
 
 
 def _default_config() -> Dict:
+    # Environment settings seed the config; runtime_config.json overrides them
     return {
-        "forward_enabled": False,
-        "destination_channel": "",
-        "source_channels": [],
+        "forward_enabled": PyroConf.FORWARD_ENABLED,
+        "destination_channel": PyroConf.DESTINATION_CHANNEL.strip(),
+        # Stored without "@", the form /forward add saves and message matching expects
+        "source_channels": [ch.strip().lstrip("@") for ch in PyroConf.SOURCE_CHANNELS.split(",") if ch.strip()],
         "mirror_enabled": False,
         "mirror_rules": {},
         "replication_enabled": False,
@@ -20,12 +38,13 @@ def _default_config() -> Dict:
     }
 
 
-def load_config() -> Dict:
+def _read_config() -> Dict:
     cfg = _default_config()
     if os.path.exists(CONFIG_PATH):
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(CONFIG_PATH, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
             if isinstance(data, dict):
                 cfg.update({
                     "forward_enabled": bool(data.get("forward_enabled", cfg["forward_enabled"])),
@@ -41,107 +60,165 @@ def load_config() -> Dict:
     return cfg
 
 
+def _to_cache(cfg: Dict) -> Dict:
+    cached = copy.deepcopy(cfg)
+    cached["source_channels"] = dict.fromkeys(cfg.get("source_channels") or [])
+    rules = cfg.get("mirror_rules")
+    cached["mirror_rules"] = {
+        src: dict.fromkeys(targets)
+        for src, targets in (rules.items() if isinstance(rules, dict) else ())
+        if isinstance(targets, (list, dict))
+    }
+    return cached
+
+
+def _export(cached: Dict) -> Dict:
+    cfg = {}
+    for key, value in cached.items():
+        if key == "source_channels":
+            cfg[key] = list(value)
+        elif key == "mirror_rules":
+            cfg[key] = {src: list(targets) for src, targets in value.items()}
+        else:
+            cfg[key] = copy.deepcopy(value)
+    return cfg
+
+
+def _cache() -> Dict:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = _to_cache(_read_config())
+    return _CACHE
+
+
+def load_config() -> Dict:
+    # A fresh copy: callers mutate what they get back before passing it to save_config
+    return _export(_cache())
+
+
 def save_config(cfg: Dict) -> None:
+    global _CACHE
+    _CACHE = _to_cache(cfg)
+    _schedule_flush()
+
+
+def _schedule_flush() -> None:
+    global _flush_handle
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to debounce on (startup, scripts): write straight away
+        _flush()
+        return
+    if _flush_handle is None:
+        _flush_handle = loop.call_later(FLUSH_DELAY, _flush)
+
+
+def _flush() -> None:
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    if _CACHE is None:
+        return
+    tmp = f"{CONFIG_PATH}.tmp"
     try:
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, ensure_ascii=False, indent=2)
+        cfg = _export(_CACHE)
+        if orjson:
+            data = orjson.dumps(cfg, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(cfg, ensure_ascii=False, indent=2).encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        # Replace in one step so a crash mid-write never leaves a truncated config
+        os.replace(tmp, CONFIG_PATH)
     except Exception:
         pass
 
 
+def flush_config() -> None:
+    """Write any pending change to disk now."""
+    if _flush_handle is not None:
+        _flush()
+
+
+atexit.register(flush_config)
+
+
 def add_source_channel(source: str) -> Dict:
-    cfg = load_config()
+    cached = _cache()
     src = source.strip()
-    if src and src not in cfg["source_channels"]:
-        cfg["source_channels"].append(src)
-        save_config(cfg)
-    return cfg
+    if src and src not in cached["source_channels"]:
+        cached["source_channels"][src] = None
+        _schedule_flush()
+    return load_config()
 
 
 def remove_source_channel(source: str) -> Dict:
-    cfg = load_config()
+    cached = _cache()
     src = source.strip()
-    if src in cfg["source_channels"]:
-        cfg["source_channels"].remove(src)
-        save_config(cfg)
-    return cfg
+    if src in cached["source_channels"]:
+        del cached["source_channels"][src]
+        _schedule_flush()
+    return load_config()
 
 
 def clear_sources() -> Dict:
-    cfg = load_config()
-    cfg["source_channels"] = []
-    save_config(cfg)
-    return cfg
+    _cache()["source_channels"] = {}
+    _schedule_flush()
+    return load_config()
 
 
 def set_target_channel(target: str) -> Dict:
-    cfg = load_config()
-    cfg["destination_channel"] = target.strip()
-    save_config(cfg)
-    return cfg
+    _cache()["destination_channel"] = target.strip()
+    _schedule_flush()
+    return load_config()
 
 
 def set_forward_enabled(enabled: bool) -> Dict:
-    cfg = load_config()
-    cfg["forward_enabled"] = bool(enabled)
-    save_config(cfg)
-    return cfg
+    _cache()["forward_enabled"] = bool(enabled)
+    _schedule_flush()
+    return load_config()
 
 
 def set_mirror_enabled(enabled: bool) -> Dict:
-    cfg = load_config()
-    cfg["mirror_enabled"] = bool(enabled)
-    save_config(cfg)
-    return cfg
+    _cache()["mirror_enabled"] = bool(enabled)
+    _schedule_flush()
+    return load_config()
 
 
 def add_mirror_rule(source: str, targets: List[str]) -> Dict:
-    cfg = load_config()
-    rules = cfg.get("mirror_rules")
-    if not isinstance(rules, dict):
-        rules = {}
+    rules = _cache()["mirror_rules"]
     src = source.strip()
     if not src:
-        return cfg
-    existing = rules.get(src)
-    if not isinstance(existing, list):
-        existing = []
+        return load_config()
+    existing = rules.setdefault(src, {})
     for t in targets:
         tt = str(t).strip()
-        if tt and tt not in existing:
-            existing.append(tt)
-    rules[src] = existing
-    cfg["mirror_rules"] = rules
-    save_config(cfg)
-    return cfg
+        if tt:
+            existing[tt] = None
+    _schedule_flush()
+    return load_config()
 
 
 def remove_mirror_rule(source: str, targets: List[str] | None = None) -> Dict:
-    cfg = load_config()
-    rules = cfg.get("mirror_rules")
-    if not isinstance(rules, dict):
-        rules = {}
+    rules = _cache()["mirror_rules"]
     src = source.strip()
     if not src:
-        return cfg
+        return load_config()
     if targets is None:
         rules.pop(src, None)
-    else:
-        existing = rules.get(src)
-        if isinstance(existing, list):
-            to_remove = {str(t).strip() for t in targets if str(t).strip()}
-            existing = [t for t in existing if t not in to_remove]
-            if existing:
-                rules[src] = existing
-            else:
-                rules.pop(src, None)
-    cfg["mirror_rules"] = rules
-    save_config(cfg)
-    return cfg
+    elif src in rules:
+        existing = rules[src]
+        for t in targets:
+            existing.pop(str(t).strip(), None)
+        if not existing:
+            del rules[src]
+    _schedule_flush()
+    return load_config()
 
 
 def clear_mirror_rules() -> Dict:
-    cfg = load_config()
-    cfg["mirror_rules"] = {}
-    save_config(cfg)
-    return cfg
+    _cache()["mirror_rules"] = {}
+    _schedule_flush()
+    return load_config()
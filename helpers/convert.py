@@ -1,8 +1,10 @@
 import asyncio
+import atexit
+import json
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from PIL import Image
 import shutil
 
@@ -17,57 +19,184 @@ def _which(cmd: str) -> Optional[str]:
 # Detect ffmpeg availability once
 if not _which("ffmpeg"):
     FFMPEG_NOT_FOUND = "ffmpeg executable not found in PATH"
+HAS_FFPROBE = bool(_which("ffprobe"))
+
+# Hardware H.264 encoders in order of preference: (name, args before -i, encode args).
+# Checked against `ffmpeg -encoders` on first use; libx264 stays the fallback.
+_HW_ENCODERS = (
+    ('h264_nvenc', [], ['-c:v','h264_nvenc','-preset','p4','-cq','23']),
+    ('h264_videotoolbox', [], ['-c:v','h264_videotoolbox','-q:v','65']),
+    ('h264_vaapi', ['-vaapi_device','/dev/dri/renderD128'],
+     ['-vf','format=nv12,hwupload','-c:v','h264_vaapi','-qp','23']),
+)
+_UNPROBED = object()
+_hw_encoder = _UNPROBED
+# Held for the one probe, so callers arriving meanwhile wait for its answer
+_hw_probe_lock = asyncio.Lock()
+
+async def _hardware_encoder():
+    """The first listed hardware encoder this ffmpeg build offers, or None."""
+    global _hw_encoder
+    if _hw_encoder is _UNPROBED:
+        async with _hw_probe_lock:
+            if _hw_encoder is _UNPROBED:
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        'ffmpeg','-hide_banner','-encoders',
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                    )
+                    out, _ = await proc.communicate()
+                except Exception:
+                    out = b''
+                listed = out.decode(errors='ignore')
+                _hw_encoder = next((e for e in _HW_ENCODERS if f' {e[0]} ' in listed), None)
+    return _hw_encoder
+
+# One scratch directory for every conversion output, removed at exit
+_TMP = tempfile.mkdtemp(prefix='rdt_conv_')
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+
+def _out_path(input_path: str, suffix: str) -> str:
+    """A fresh output file, so concurrent conversions of same-named inputs never collide."""
+    fd, path = tempfile.mkstemp(prefix=Path(input_path).stem + '_', suffix=suffix, dir=_TMP)
+    os.close(fd)
+    return path
+
+# Containers Telegram plays as-is when they hold H.264 video and AAC audio
+MP4_FAMILY = ('.mp4', '.mov', '.m4v')
+# ffprobe results keyed by (path, mtime, size), so repeat calls on one file are free
+_PROBE_CACHE: Dict[tuple, Tuple[Optional[str], Optional[str]]] = {}
+_PROBE_CACHE_SIZE = 256
+
+async def _probe_codecs(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (video_codec, audio_codec) of the first streams, or (None, None) if unknown."""
+    if not HAS_FFPROBE:
+        return None, None
+    st = await asyncio.to_thread(os.stat, path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    cached = _PROBE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe','-v','quiet','-print_format','json','-show_streams', path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    if proc.returncode != 0:
+        return None, None
+    video = audio = None
+    for stream in json.loads(out or b'{}').get('streams', []):
+        kind = stream.get('codec_type')
+        if kind == 'video' and video is None:
+            video = stream.get('codec_name')
+        elif kind == 'audio' and audio is None:
+            audio = stream.get('codec_name')
+    if len(_PROBE_CACHE) >= _PROBE_CACHE_SIZE:
+        _PROBE_CACHE.pop(next(iter(_PROBE_CACHE)))
+    _PROBE_CACHE[key] = (video, audio)
+    return video, audio
 
 async def ensure_mp4(input_path: str) -> str:
     """
-    Ensure a video file is in mp4 (H.264/AAC) container. If already .mp4, return original.
-    Otherwise transcode using ffmpeg (copy streams if possible, else re-encode).
+    Ensure a video file is in mp4 (H.264/AAC) container. If already .mp4, or a .mov/.m4v
+    that ffprobe shows is H.264/AAC, return original. Otherwise remux with ffmpeg
+    (stream copy) when the codecs allow it, falling back to a re-encode on a hardware
+    encoder when ffmpeg offers one, else libx264.
     On failure, returns original path.
     """
+    global _hw_encoder
     try:
-        if not os.path.isfile(input_path):
-            return input_path
         lower = input_path.lower()
         if lower.endswith('.mp4'):
             return input_path
+        if not await asyncio.to_thread(os.path.isfile, input_path):
+            return input_path
         if FFMPEG_NOT_FOUND:
             LOGGER(__name__).warning(f"Skipping conversion (mp4) - {FFMPEG_NOT_FOUND}")
             return input_path
-        out_path = str(Path(tempfile.gettempdir()) / (Path(input_path).stem + '_conv.mp4'))
-        cmd = [
-            'ffmpeg','-y','-i', input_path,
-            '-c:v','libx264','-preset','veryfast','-crf','23',
-            '-c:a','aac','-b:a','128k','-movflags','+faststart',
-            out_path
-        ]
-        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
-        await proc.communicate()
-        if proc.returncode == 0 and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        video, audio = await _probe_codecs(input_path)
+        compatible = video == 'h264' and audio in (None, 'aac')
+        if compatible and lower.endswith(MP4_FAMILY):
+            return input_path
+        out_path = _out_path(input_path, '_conv.mp4')
+        # Most mkv/mov inputs already carry H.264/AAC: a stream-copy remux runs at disk speed.
+        # Without ffprobe we cannot tell, so just try it.
+        if compatible or video is None:
+            remux = ['-c','copy','-movflags','+faststart']
+            if await _run_ffmpeg(input_path, remux, out_path):
+                return out_path
+        audio_args = ['-c:a','aac','-b:a','128k','-movflags','+faststart']
+        hw = await _hardware_encoder()
+        if hw:
+            name, pre_args, video_args = hw
+            if await _run_ffmpeg(input_path, video_args + audio_args, out_path, pre_args):
+                return out_path
+        reencode = ['-c:v','libx264','-preset','veryfast','-crf','23'] + audio_args
+        if await _run_ffmpeg(input_path, reencode, out_path):
+            if hw and _hw_encoder is hw:
+                # libx264 managed what the hardware encoder could not: the encoder is
+                # listed but unusable here (no device or driver), so stop trying it
+                _hw_encoder = None
+                LOGGER(__name__).warning(f"{name} encode failed; using libx264 from now on")
             return out_path
         return input_path
     except Exception as e:
         LOGGER(__name__).warning(f"ensure_mp4 failed: {e}")
         return input_path
 
+async def _run_ffmpeg(input_path: str, args: list, out_path: str, pre_args: Optional[list] = None) -> bool:
+    """Run ffmpeg on input_path; True if it produced a non-empty out_path."""
+    cmd = ['ffmpeg','-y', *(pre_args or []), '-i', input_path, *args, out_path]
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+    await proc.communicate()
+    # stat/remove can stall on slow or network disks; keep them off the event loop
+    return await asyncio.to_thread(_keep_if_written, out_path, proc.returncode == 0)
+
+def _keep_if_written(out_path: str, succeeded: bool) -> bool:
+    """True if out_path is a non-empty result; otherwise remove whatever was left behind."""
+    if succeeded and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        return True
+    try:
+        os.remove(out_path)
+    except OSError:
+        pass
+    return False
+
 async def ensure_png(input_path: str) -> str:
     """Ensure an image is in PNG format. If already .png, return original; else convert via Pillow."""
     try:
-        if not os.path.isfile(input_path):
-            return input_path
         lower = input_path.lower()
         if lower.endswith('.png'):
             return input_path
-        # Basic heuristic: treat as image if Pillow can open it
-        with Image.open(input_path) as im:
-            out_path = str(Path(tempfile.gettempdir()) / (Path(input_path).stem + '_conv.png'))
-            im.save(out_path, format='PNG')
-            if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
-                return out_path
-        return input_path
+        # Decoding and PNG encoding are CPU-bound, and even the stat and signature
+        # read touch the disk; keep all of it off the event loop
+        return await asyncio.to_thread(_save_png, input_path)
     except Exception as e:
         LOGGER(__name__).warning(f"ensure_png failed: {e}")
         return input_path
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _save_png(input_path: str) -> str:
+    if not os.path.isfile(input_path):
+        return input_path
+    # Already a PNG under another extension: nothing to transcode
+    with open(input_path, 'rb') as f:
+        if f.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE:
+            return input_path
+    out_path = _out_path(input_path, '_conv.png')
+    try:
+        # Basic heuristic: treat as image if Pillow can open it
+        with Image.open(input_path) as im:
+            # zlib level 1 encodes several times faster than the default 6 for a modestly larger file
+            im.save(out_path, format='PNG', compress_level=1)
+    except Exception:
+        _keep_if_written(out_path, False)
+        raise
+    if _keep_if_written(out_path, True):
+        return out_path
+    return input_path
+
 async def normalize_media(path: str, is_video: bool, is_image: bool) -> str:
     """
     Convenience wrapper to choose ensure_mp4 / ensure_png.
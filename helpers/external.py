@@ -1,13 +1,14 @@
 import asyncio
+import atexit
 import os
 import re
 import tempfile
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Callable, Awaitable, Any, Union, Coroutine
+from typing import Optional, Dict, Callable, Awaitable, Any, List, Union, Coroutine
 import time
-import threading
-import json
 import base64
 
 from logger import LOGGER
@@ -18,77 +19,155 @@ try:
 except Exception as e:  # pragma: no cover
     YTDLP_IMPORT_ERROR = e
 
+# URL tail: stops at whitespace and the punctuation that usually wraps a link in
+# chat, so no pattern can run on across a long message.
+_URL_TAIL = r"[^\s<>\"'()\[\],;]+"
+
 SUPPORTED_PATTERNS = [
-    r"https?://(www\.)?youtube\.com/\S+",        # YouTube full
-    r"https?://youtu\.be/\S+",                      # YouTube short
-    r"https?://(www\.)?instagram\.com/\S+",        # Instagram posts/reels
-    r"https?://(www\.)?pin(?:terest)?\.\S+",      # Pinterest
-    r"https?://(www\.)?pin\.it/\S+",              # Pinterest short links
+    r"https?://(www\.)?youtube\.com/" + _URL_TAIL,        # YouTube full
+    r"https?://youtu\.be/" + _URL_TAIL,                      # YouTube short
+    r"https?://(www\.)?instagram\.com/" + _URL_TAIL,        # Instagram posts/reels
+    r"https?://(www\.)?pin(?:terest)?\." + _URL_TAIL,      # Pinterest
+    r"https?://(www\.)?pin\.it/" + _URL_TAIL,              # Pinterest short links
 ]
 
-COMPILED_PATTERNS = [re.compile(p, re.IGNORECASE) for p in SUPPORTED_PATTERNS]
+# Telegram caps message text at 4096 characters; never scan more than that.
+MAX_SCAN_CHARS = 4096
+
+# One alternation so each message is scanned once; the leftmost link wins.
+SUPPORTED_URL_RE = re.compile("|".join(f"(?:{p})" for p in SUPPORTED_PATTERNS), re.IGNORECASE)
+# Checked on every incoming message; skip the attribute lookup per call.
+_search_url = SUPPORTED_URL_RE.search
 
 
 def is_supported_url(url: str) -> bool:
-    return any(p.search(url) for p in COMPILED_PATTERNS)
+    return _search_url(url[:MAX_SCAN_CHARS]) is not None
 
 
 def extract_supported_url(text: str) -> Optional[str]:
     """Extract first supported external URL from arbitrary text.
 
     Returns the matched URL string or None.
-    Strips trailing punctuation that may be adjacent in chat messages.
+    Brackets, quotes and commas around the link are never matched; only a
+    sentence-ending period needs trimming.
     """
     if not text:
         return None
-    for p in COMPILED_PATTERNS:
-        m = p.search(text)
-        if m:
-            url = m.group(0)
-            # Trim common trailing punctuation
-            url = url.rstrip(').,;\n\r')
-            return url
-    return None
+    m = _search_url(text[:MAX_SCAN_CHARS])
+    if not m:
+        return None
+    return m.group(0).rstrip(".")
 
 
-async def _run_in_thread(func, *args, **kwargs):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+# yt-dlp runs for minutes at a time; keep it off the default executor so it
+# cannot starve the short to_thread calls made elsewhere in the bot.
+_DL_POOL = ThreadPoolExecutor(
+    max_workers=max(1, int(os.environ.get("EXTDL_WORKERS", "4"))),
+    thread_name_prefix="extdl",
+)
+atexit.register(_DL_POOL.shutdown, wait=False)
 
 
-ProgressCallable = Callable[[Dict[str, Any]], Union[Awaitable[None], None]]
+class _DownloadJobs:
+    """The yt-dlp jobs of one download and the temp dirs they write into."""
 
+    def __init__(self, tmp_dir: Path) -> None:
+        self.dirs: List[Path] = [tmp_dir]
+        self._current: Optional[Future] = None
 
-async def download_external_media(url: str, progress_cb: Optional[ProgressCallable] = None) -> Optional[Dict]:
-    """Download a single video (or first format) from supported external platforms.
+    async def run(self, func, *args):
+        self._current = _DL_POOL.submit(func, *args)
+        return await asyncio.wrap_future(self._current)
 
-    Returns dict with keys: path, title, ext, filesize (int or None)
-    """
-    if YTDLP_IMPORT_ERROR:
-        LOGGER(__name__).error(f"yt-dlp import failed: {YTDLP_IMPORT_ERROR}")
-        return {"error": f"import_failed: {YTDLP_IMPORT_ERROR}"}
+    def remove_dirs(self) -> None:
+        for path in self.dirs:
+            shutil.rmtree(path, ignore_errors=True)
 
-    tmp_dir = Path(tempfile.mkdtemp(prefix="extdl_"))
-    out_tpl = str(tmp_dir / "%(title).200s.%(ext)s")
+    def abandon(self) -> None:
+        """
+        Remove the dirs of a cancelled download without blocking the loop.
 
-    ffmpeg_path = shutil.which("ffmpeg")
-    if not ffmpeg_path:
+        Cancelling the await does not stop a job already running on _DL_POOL;
+        it keeps writing into its dir, so removal waits for that job to end.
+        """
+        job = self._current
+        if job is not None and not job.done():
+            job.add_done_callback(lambda _: self.remove_dirs())
+        else:
+            _DL_POOL.submit(self.remove_dirs)
+
+
+# Options shared by every yt-dlp attempt. Each download layers outtmpl, format and
+# cookies on a shallow copy; the nested values are shared because yt-dlp copies
+# them before changing anything.
+_YDL_BASE: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "restrictfilenames": True,
+    "ignoreerrors": True,
+    "skip_download": False,
+    "nocheckcertificate": True,
+    # Prefer best MP4 video + best audio first; allow larger size threshold for quality.
+    "format": "(bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo*+bestaudio/bestvideo+bestaudio/best)[filesize<4G]/best",
+    "merge_output_format": "mp4",
+    # Postprocessors ensure audio is merged/remuxed; if already single file it passes quickly.
+    "postprocessors": [
+        {"key": "FFmpegVideoConvertor", "preferedformat": "mp4"},
+    ],
+    "noplaylist": True,
+    # Try multiple player clients for YouTube to dodge some gating
+    "extractor_args": {
+        "youtube": {
+            "player_client": ["android", "web"],
+        }
+    },
+    # Add a realistic user-agent to improve compatibility (esp. Pinterest)
+    "http_headers": {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+        )
+    },
+}
+
+# Multi-tier fallback strategy. We attempt progressively simpler format strings.
+# This helps with Pinterest where certain combined format expressions fail.
+_FALLBACK_FORMATS = (
+    _YDL_BASE["format"],
+    # Alternate ordering with explicit audio before generic best
+    "bestvideo*+bestaudio/bestvideo+bestaudio",
+    "bestaudio+bestvideo/best",
+    "best[ext=mp4]/best",
+    "best",
+    "b",
+)
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_path() -> Optional[str]:
+    """Looked up once per process; installing ffmpeg later needs a restart."""
+    path = shutil.which("ffmpeg")
+    if not path:
         LOGGER(__name__).warning("ffmpeg not found in PATH: external downloads may lose audio or stay in original container")
+    return path
+
+
+@lru_cache(maxsize=1)
+def _cookiefile() -> Optional[str]:
+    """
+    Resolve the yt-dlp cookies file, cached until forget_cookiefile().
 
+    Startup sources (decrypted ENCRYPTED_COOKIES, base64 env) exist before
+    the first download; /cookies uploads call forget_cookiefile().
+    """
     # Cookies resolution (priority): explicit env file -> decrypted cookies (FERNET) -> base64 env -> local file
     cookiefile: Optional[str] = None
     env_cookie = os.environ.get("YTDLP_COOKIES_FILE")
     if env_cookie and os.path.isfile(env_cookie):
         cookiefile = env_cookie
-    else:
-        # If decrypted cookie (from encrypted env) has been produced earlier in startup, use it
-        decrypted_cookie = Path("cookies") / "cookies.txt"
-        if decrypted_cookie.exists():
-            cookiefile = str(decrypted_cookie)
-        else:
-            default_cookie = Path("cookies") / "cookies.txt"
-            if default_cookie.exists():  # fallback legacy path (same path though)
-                cookiefile = str(default_cookie)
+    elif (Path("cookies") / "cookies.txt").exists():
+        # Decrypted cookies (from encrypted env) or a file dropped in by hand
+        cookiefile = str(Path("cookies") / "cookies.txt")
     # Base64 inline cookies support (YTDLP_COOKIES_B64) to persist across Heroku restarts
     if not cookiefile:
         b64 = os.environ.get("YTDLP_COOKIES_B64")
@@ -106,55 +185,75 @@ async def download_external_media(url: str, progress_cb: Optional[ProgressCallab
     if not cookiefile and os.environ.get("FERNET_KEY") and os.environ.get("ENCRYPTED_COOKIES"):
         LOGGER(__name__).warning("[ext] Encrypted cookies vars present but decrypted file missing; ensure main startup ran _decrypt_cookies_if_present early.")
 
-    ydl_opts = {
-        "outtmpl": out_tpl,
-        "quiet": True,
-        "no_warnings": True,
-        "restrictfilenames": True,
-        "ignoreerrors": True,
-        "skip_download": False,
-        "nocheckcertificate": True,
-        # Prefer best MP4 video + best audio first; allow larger size threshold for quality.
-        "format": "(bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo*+bestaudio/bestvideo+bestaudio/best)[filesize<4G]/best",
-        "merge_output_format": "mp4",
-        # Postprocessors ensure audio is merged/remuxed; if already single file it passes quickly.
-        "postprocessors": [
-            {"key": "FFmpegVideoConvertor", "preferedformat": "mp4"},
-        ],
-        "noplaylist": True,
-        # Try multiple player clients for YouTube to dodge some gating
-        "extractor_args": {
-            "youtube": {
-                "player_client": ["android", "web"],
-            }
-        },
-        # Add a realistic user-agent to improve compatibility (esp. Pinterest)
-        "http_headers": {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-            )
-        },
-    }
+    return cookiefile
+
+
+def forget_cookiefile() -> None:
+    """Drop the cached cookies lookup so the next download sees a new file."""
+    _cookiefile.cache_clear()
+
+
+ProgressCallable = Callable[[Dict[str, Any]], Union[Awaitable[None], None]]
+
+
+async def download_external_media(url: str, progress_cb: Optional[ProgressCallable] = None) -> Optional[Dict]:
+    """Download a single video (or first format) from supported external platforms.
 
+    Returns dict with keys: path, title, ext, filesize (int or None)
+    """
+    if YTDLP_IMPORT_ERROR:
+        LOGGER(__name__).error(f"yt-dlp import failed: {YTDLP_IMPORT_ERROR}")
+        return {"error": f"import_failed: {YTDLP_IMPORT_ERROR}"}
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="extdl_"))
+    out_tpl = str(tmp_dir / "%(title).200s.%(ext)s")
+
+    ffmpeg_path = _ffmpeg_path()
+    cookiefile = _cookiefile()
+    ydl_opts = {**_YDL_BASE, "outtmpl": out_tpl}
     if cookiefile:
         ydl_opts["cookiefile"] = cookiefile
         LOGGER(__name__).info(f"[ext] Using cookies file: {cookiefile}")
 
-    loop = asyncio.get_running_loop()
-
+    reporter: Optional[asyncio.Task] = None
     if progress_cb:
-        last_update = {"t": 0.0}
-        lock = threading.Lock()
+        loop = asyncio.get_running_loop()
+        # Ticks coalesce into one slot drained by a single task, so a long
+        # download spawns one task instead of one per progress update.
+        latest: Dict[str, Any] = {}
+        wake = asyncio.Event()
+
+        def _post(data):  # runs on the loop
+            latest["data"] = data
+            wake.set()
+
+        async def _deliver(data):
+            try:
+                res = progress_cb(data)
+                if asyncio.iscoroutine(res):
+                    await res
+            except Exception:
+                pass
+
+        async def _report():
+            while True:
+                await wake.wait()
+                wake.clear()
+                data = latest["data"]
+                await _deliver(data)
+                latest["sent"] = data
+
+        reporter = asyncio.create_task(_report())
+        # No lock: a race between fragment threads at worst lets one extra tick through
+        last_update = [0.0]
 
         def hook(d):  # Runs inside downloader thread
             status = d.get("status")
-            now = time.time()
             if status == "downloading":
-                with lock:
-                    if now - last_update["t"] < 0.8:  # throttle updates
-                        return
-                    last_update["t"] = now
+                now = time.monotonic()
+                if now - last_update[0] < 0.8:  # throttle updates
+                    return
+                last_update[0] = now
                 downloaded = d.get("downloaded_bytes") or 0
                 total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
                 percent = (downloaded / total * 100) if total else None
@@ -170,32 +269,106 @@ async def download_external_media(url: str, progress_cb: Optional[ProgressCallab
                 }
                 if percent is not None:
                     try:
-                        def _dispatch():
-                            try:
-                                res = progress_cb(data)
-                                if asyncio.iscoroutine(res):
-                                    asyncio.create_task(res)
-                            except Exception:
-                                pass
-                        loop.call_soon_threadsafe(_dispatch)
+                        loop.call_soon_threadsafe(_post, data)
                     except Exception:
                         pass
             elif status == "finished":
-                data = {"status": "finished"}
                 try:
-                    def _dispatch_finish():
-                        try:
-                            res = progress_cb(data)
-                            if asyncio.iscoroutine(res):
-                                asyncio.create_task(res)
-                        except Exception:
-                            pass
-                    loop.call_soon_threadsafe(_dispatch_finish)
+                    loop.call_soon_threadsafe(_post, {"status": "finished"})
                 except Exception:
                     pass
 
         ydl_opts["progress_hooks"] = [hook]
 
+    jobs = _DownloadJobs(tmp_dir)
+    try:
+        result = await _download_with_fallbacks(url, jobs, ydl_opts, ffmpeg_path, cookiefile)
+    except asyncio.CancelledError:
+        jobs.abandon()
+        raise
+    except Exception:
+        # The job that failed has finished, so nothing writes into the dirs now
+        await asyncio.to_thread(jobs.remove_dirs)
+        raise
+    finally:
+        if reporter:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+    # The reporter may have been cancelled before (or while) delivering the
+    # last tick, typically "finished", so hand it over once it has stopped.
+    if reporter and "data" in latest and latest.get("sent") is not latest["data"]:
+        await _deliver(latest["data"])
+    # Error results carry no tmp_dir for cleanup_external, so drop partial files here
+    if result.get("error"):
+        await asyncio.to_thread(jobs.remove_dirs)
+    return result
+
+
+# Failures no format change can fix; anything else (notably "Requested format
+# is not available") still walks the fallback list.
+_FINAL_ERROR_MARKERS = (
+    "video unavailable",
+    "private video",
+    "this video is private",
+    "has been removed",
+    "http error 403",
+    "http error 404",
+    "sign in to confirm",
+    "login required",
+    "not available in your country",
+    "not available from your location",
+    "unsupported url",
+)
+
+
+def _is_final_error(message: str) -> bool:
+    lowered = message.lower()
+    return any(marker in lowered for marker in _FINAL_ERROR_MARKERS)
+
+
+class _YdlErrorLog:
+    """yt-dlp logger that keeps the last error and drops everything else."""
+
+    def __init__(self) -> None:
+        self.last: Optional[str] = None
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    info = warning = debug
+
+    def error(self, msg: str) -> None:
+        self.last = msg
+
+
+def _downloaded_file(info: Dict[str, Any], tmp_dir: Path) -> Optional[Path]:
+    """
+    Final file of a yt-dlp run.
+
+    yt-dlp reports the post-merge path in ``requested_downloads``; only when
+    that is missing do we fall back to the first file in ``tmp_dir``.
+    """
+    if "entries" in info and info["entries"]:
+        info = info["entries"][0]
+    for entry in info.get("requested_downloads") or ():
+        path = entry.get("filepath")
+        if path and os.path.isfile(path):
+            return Path(path)
+    with os.scandir(tmp_dir) as it:
+        return next((Path(e.path) for e in it if e.is_file()), None)
+
+
+def _declares_audio(info: Dict[str, Any]) -> bool:
+    """Whether yt-dlp's metadata names an audio codec for the chosen format(s)."""
+    formats = (info, *(info.get("requested_formats") or ()))
+    return any(f.get("acodec") not in (None, "none") for f in formats)
+
+
+async def _download_with_fallbacks(
+    url: str, jobs: _DownloadJobs, ydl_opts: Dict[str, Any], ffmpeg_path: Optional[str], cookiefile: Optional[str]
+) -> Dict:
+    """Run yt-dlp through the fallback formats, then locate and audio-check the file."""
+    tmp_dir = jobs.dirs[0]
     def _download(local_opts):  # runs in thread
         if 'ytdlp' not in globals():
             return None
@@ -203,45 +376,37 @@ async def download_external_media(url: str, progress_cb: Optional[ProgressCallab
             info = ydl.extract_info(url, download=True)
             return info
 
-    # Multi-tier fallback strategy. We attempt progressively simpler format strings.
-    # This helps with Pinterest where certain combined format expressions fail.
-    base_format = ydl_opts["format"]
-    fallback_formats = [
-        base_format,
-        # Alternate ordering with explicit audio before generic best
-        "bestvideo*+bestaudio/bestvideo+bestaudio",
-        "bestaudio+bestvideo/best",
-        "best[ext=mp4]/best",
-        "best",
-        "b",
-    ]
-
     info = None
     errors: list[str] = []
     attempt = 0
-    for fmt in fallback_formats:
+    for fmt in _FALLBACK_FORMATS:
         attempt += 1
-        local_opts = dict(ydl_opts)
-        local_opts["format"] = fmt
+        # ignoreerrors=True makes yt-dlp report most failures here instead of raising
+        ydl_log = _YdlErrorLog()
+        local_opts = {**ydl_opts, "format": fmt, "logger": ydl_log}
         # Keep postprocessors while ffmpeg present for first two attempts, then drop to reduce failures
         if attempt > 2 or not ffmpeg_path:
-            local_opts.pop("postprocessors", None)
+            del local_opts["postprocessors"]
         try:
             LOGGER(__name__).info(f"[ext] Attempt {attempt} format='{fmt}' for url={url}")
-            info = await _run_in_thread(_download, local_opts)
+            info = await jobs.run(_download, local_opts)
             if info:
                 if attempt > 1:
                     LOGGER(__name__).info(f"[ext] Fallback attempt {attempt} succeeded with format '{fmt}'.")
                 break
+            err_msg = ydl_log.last
         except Exception as e:
             err_msg = str(e) or repr(e)
-            errors.append(err_msg)
-            # Decide whether to continue. If last attempt, return error.
-            # Log condensed reason.
-            key_err = err_msg.splitlines()[0][:200]
-            LOGGER(__name__).warning(f"[ext] Attempt {attempt} failed: {key_err}")
-            # Continue to next attempt automatically
+        if not err_msg:
             continue
+        errors.append(err_msg)
+        # Log condensed reason.
+        key_err = err_msg.splitlines()[0][:200]
+        LOGGER(__name__).warning(f"[ext] Attempt {attempt} failed: {key_err}")
+        # A simpler format cannot fix a private, removed or blocked video
+        if _is_final_error(err_msg):
+            LOGGER(__name__).info("[ext] Error is not format related; skipping remaining fallbacks.")
+            break
 
     if not info:
         if not errors:
@@ -253,72 +418,64 @@ async def download_external_media(url: str, progress_cb: Optional[ProgressCallab
     if "entries" in info and info["entries"]:
         info = info["entries"][0]
 
-    # Find the downloaded file (yt-dlp returns exact filename pattern)
     title = info.get("title") or "video"
     ext = info.get("ext", "mp4")
-    # Attempt to construct expected filename
-    expected = list(tmp_dir.glob(f"{title[:200]}*.{ext}"))
-    if not expected:
-        # Fallback: pick any file in temp dir
-        candidates = list(tmp_dir.glob("*"))
-        if not candidates:
-            return {"error": "file_missing_after_download"}
-        file_path = candidates[0]
-    else:
-        file_path = expected[0]
+    file_path = _downloaded_file(info, tmp_dir)
+    if file_path is None:
+        return {"error": "file_missing_after_download"}
 
     size = file_path.stat().st_size if file_path.exists() else None
 
-    # Probe audio stream presence for video containers
+    # Probe audio stream presence for video containers, unless yt-dlp already
+    # told us which audio codec it fetched
     audio_missing = False
-    if ffmpeg_path and file_path.suffix.lower() in (".mp4", ".mkv", ".webm", ".mov"):
+    if (
+        ffmpeg_path
+        and file_path.suffix.lower() in (".mp4", ".mkv", ".webm", ".mov")
+        and not _declares_audio(info)
+    ):
         try:
             probe_cmd = [
                 "ffprobe", "-v", "error",
                 "-select_streams", "a",
-                "-show_entries", "stream=index",
-                "-of", "json", str(file_path)
+                "-show_entries", "stream=codec_type",
+                "-of", "csv=p=0", str(file_path)
             ]
             proc = await asyncio.create_subprocess_exec(*probe_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
             out, _ = await proc.communicate()
-            if out:
-                meta = json.loads(out.decode() or '{}')
-                streams = meta.get("streams") or []
-                if not streams:
-                    audio_missing = True
+            # One "audio" line per stream; empty output only counts if the probe itself succeeded
+            if proc.returncode == 0:
+                audio_missing = b"audio" not in out
         except Exception:
             pass
 
     # If audio missing attempt one recovery re-download with broad format
     if audio_missing and ffmpeg_path:
         LOGGER(__name__).warning(f"[ext] No audio stream detected; attempting recovery download for {url}")
+        tmp_dir2 = Path(tempfile.mkdtemp(prefix="extdl_fix_"))
+        jobs.dirs.append(tmp_dir2)
         try:
-            tmp_dir2 = Path(tempfile.mkdtemp(prefix="extdl_fix_"))
-            recover_opts = dict(ydl_opts)
-            recover_opts["outtmpl"] = str(tmp_dir2 / "%(title).200s.%(ext)s")
-            recover_opts["format"] = "bestaudio+bestvideo/best"
-            # Keep postprocessors for recovery if ffmpeg exists
-            if not ffmpeg_path:
-                recover_opts.pop("postprocessors", None)
-            info2 = await _run_in_thread(_download, recover_opts)
+            recover_opts = {
+                **ydl_opts,
+                "outtmpl": str(tmp_dir2 / "%(title).200s.%(ext)s"),
+                "format": "bestaudio+bestvideo/best",
+            }
+            info2 = await jobs.run(_download, recover_opts)
             if info2:
                 # Update file target
-                candidates2 = list(tmp_dir2.glob("*"))
-                if candidates2:
-                    file_path2 = candidates2[0]
-                    if file_path2.exists() and file_path2.stat().st_size > 0:
-                        # Replace original
-                        try:
-                            shutil.rmtree(tmp_dir, ignore_errors=True)
-                        except Exception:
-                            pass
-                        tmp_dir = tmp_dir2
-                        file_path = file_path2
-                        size = file_path.stat().st_size
-                        audio_missing = False  # assume recovered
-                        LOGGER(__name__).info("[ext] Audio recovery succeeded.")
+                file_path2 = _downloaded_file(info2, tmp_dir2)
+                if file_path2 is not None and file_path2.stat().st_size > 0:
+                    # Replace original
+                    await asyncio.to_thread(shutil.rmtree, tmp_dir, ignore_errors=True)
+                    tmp_dir = tmp_dir2
+                    file_path = file_path2
+                    size = file_path.stat().st_size
+                    audio_missing = False  # assume recovered
+                    LOGGER(__name__).info("[ext] Audio recovery succeeded.")
         except Exception as e:
             LOGGER(__name__).warning(f"[ext] Audio recovery failed: {e}")
+        if tmp_dir is not tmp_dir2:
+            await asyncio.to_thread(shutil.rmtree, tmp_dir2, ignore_errors=True)
 
     return {
         "path": str(file_path),
@@ -338,15 +495,7 @@ async def cleanup_external(result: Dict):
     try:
         tmp_dir = result.get("tmp_dir")
         if tmp_dir and os.path.isdir(tmp_dir):
-            for root, _, files in os.walk(tmp_dir, topdown=False):
-                for f in files:
-                    try:
-                        os.remove(os.path.join(root, f))
-                    except Exception:
-                        pass
-            try:
-                os.rmdir(tmp_dir)
-            except Exception:
-                pass
+            # Fragment-heavy downloads leave many files; delete them off the loop
+            await asyncio.to_thread(shutil.rmtree, tmp_dir, ignore_errors=True)
     except Exception as e:
         LOGGER(__name__).warning(f"External cleanup issue: {e}")
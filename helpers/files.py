@@ -1,13 +1,17 @@
 import logging
 import shutil
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 
 # Constants representing file size units and limits for standard and premium users
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
 BYTES_IN_GB = 1024**3
 MAX_FILE_SIZE_BYTES = 2 * BYTES_IN_GB             # 2 GB limit for regular users
 PREMIUM_MAX_FILE_SIZE_BYTES = 4 * BYTES_IN_GB     # 4 GB limit for premium users
+IN_MEMORY_MAX_BYTES = 50 * 1024**2               # Reuploads at or below this size skip the disk
+
+# Message attributes that carry a sized file, in lookup order
+SIZED_MEDIA_ATTRS = ("document", "video", "photo", "animation", "sticker", "video_note", "audio", "voice")
 
 # Logger setup for monitoring and debugging
 logging.basicConfig(level=logging.INFO)
@@ -60,6 +64,35 @@ def cleanup_download(path: Union[str, Path]) -> None:
         LOGGER.error(f"Cleanup failed for {path}: {e}")
 
 
+def cleanup_downloads(paths: Iterable[Union[str, Path]]) -> None:
+    """
+    Runs cleanup_download for each path. Meant to be handed to asyncio.to_thread so a
+    whole batch of unlinks costs one hop off the event loop.
+
+    Args:
+        paths: Paths to the downloaded files.
+    """
+    for path in paths:
+        cleanup_download(path)
+
+
+def get_media_size(message) -> Optional[int]:
+    """
+    Returns the file size Telegram reports for a message's media.
+
+    Args:
+        message: The message object, potentially containing media.
+
+    Returns:
+        Optional[int]: Size in bytes, or None if the message has no sized media.
+    """
+    for attr in SIZED_MEDIA_ATTRS:
+        media = getattr(message, attr, None)
+        if media:
+            return getattr(media, "file_size", None)
+    return None
+
+
 def get_readable_file_size(size_in_bytes: Optional[float]) -> str:
     """
     Converts a file size in bytes to a human-readable string with appropriate units.
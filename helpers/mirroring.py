@@ -94,12 +94,15 @@ class MirrorManager:
 
         for target in targets:
             try:
+                # Cached numeric id, so pyrogram skips username resolution on every post
+                target_chat = await self.channel_cloner._resolve_chat_id(target)
                 target_msg_id = await self.channel_cloner._copy_single_message(
                     message.chat.id,
-                    target,
+                    target_chat,
                     message.id,
                     None,
                     return_message_id=True,
+                    source_msg=message,
                 )
                 if target_msg_id:
                     self.store.set_mapping(message.chat.id, message.id, str(target), int(target_msg_id))
@@ -118,17 +121,18 @@ class MirrorManager:
                 target_msg_id = self.store.get_mapping(message.chat.id, message.id, str(target))
                 if not target_msg_id:
                     continue
+                target_chat = await self.channel_cloner._resolve_chat_id(target)
 
                 if message.text and not message.media:
                     await self.user.edit_message_text(
-                        chat_id=target,
+                        chat_id=target_chat,
                         message_id=target_msg_id,
                         text=message.text,
                         entities=getattr(message, "entities", None),
                     )
                 elif message.caption and message.media:
                     await self.user.edit_message_caption(
-                        chat_id=target,
+                        chat_id=target_chat,
                         message_id=target_msg_id,
                         caption=message.caption,
                         caption_entities=getattr(message, "caption_entities", None),
@@ -0,0 +1,87 @@
+import asyncio
+import random
+from time import monotonic
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by concurrent workers.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Callers await ``acquire()`` before each Telegram API call; waiters are
+    served in FIFO order so bursts are smoothed out across workers.
+
+    The rate adapts to flood control: ``penalize()`` shrinks it after a
+    FloodWait and ``reward()`` ramps it back towards the configured rate
+    after a streak of clean calls.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        *,
+        min_rate: float = 0.5,
+        recover_after: int = 50,
+    ) -> None:
+        self.rate = float(rate)
+        self.max_rate = self.rate
+        self.min_rate = min(float(min_rate), self.rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.recover_after = max(1, recover_after)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._streak = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and consume them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def penalize(self, factor: float = 0.8) -> None:
+        """Lower the refill rate after a FloodWait."""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * factor)
+        self._streak = 0
+
+    def drain(self, seconds: float) -> None:
+        """
+        Empty the bucket so the next token is at least ``seconds`` away.
+
+        Used on FloodWait: every worker queued on ``acquire()`` then backs off
+        together instead of each sleeping on its own. Overlapping drains do not
+        stack; the longest one wins.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def reward(self) -> None:
+        """Record a clean call; step the rate back up after a full streak."""
+        self._streak += 1
+        if self._streak >= self.recover_after and self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+            self._streak = 0
+
+
+def backoff_delay(wait: float, attempt: int, *, base: float = 0.5, cap: float = 300.0) -> float:
+    """
+    Seconds to sleep before retry ``attempt`` (0-based) after a FloodWait of ``wait``.
+
+    Adds full jitter that doubles with each attempt on top of the server's wait,
+    so repeated floods back off further and concurrent retries spread out.
+    Only the jitter is capped: the wait Telegram asked for is always honoured.
+    """
+    return wait + min(random.uniform(0, base * 2 ** attempt), cap)
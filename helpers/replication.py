@@ -24,6 +24,20 @@ from types import SimpleNamespace
 
 from logger import LOGGER
 from helpers.config_store import load_config, save_config
+from helpers.files import IN_MEMORY_MAX_BYTES, get_media_size
+from helpers.ratelimit import backoff_delay
+
+
+# Minimum seconds between backfill progress callbacks; well above the 1.5 s
+# per-message pace so a status edit covers several messages
+PROGRESS_INTERVAL = 5.0
+
+
+async def _safe_progress(callback, *args) -> None:
+    try:
+        await callback(*args)
+    except Exception:
+        pass
 
 
 class ReplicationStore:
@@ -145,13 +159,17 @@ class ReplicationManager:
     - Deduplication
     """
     
-    def __init__(self, user: Client) -> None:
+    def __init__(self, user: Client, in_memory_max_bytes: int = IN_MEMORY_MAX_BYTES) -> None:
         self.user = user
+        self.in_memory_max_bytes = in_memory_max_bytes
         self.store = ReplicationStore()
         self.running = False
         self.backfill_tasks: Dict[str, asyncio.Task] = {}
         self._lock = asyncio.Lock()
         self._media_group_cache: Dict[str, bool] = {}  # Track processed media groups
+        # Sources that rejected a file_id send with CHAT_FORWARDS_RESTRICTED; later media
+        # from them goes straight to the download path instead of failing first
+        self._protected_sources: set = set()
     
     def get_mappings(self) -> List[Dict]:
         """Get all source-target channel mappings from config."""
@@ -270,7 +288,10 @@ class ReplicationManager:
             else:
                 file_name_arg = base_path
 
-            path = await self.user.download_media(message, file_name=file_name_arg)
+            # Nothing is converted here, so small files can go straight through memory
+            size = get_media_size(message)
+            in_memory = size is not None and size <= self.in_memory_max_bytes
+            path = await self.user.download_media(message, file_name=file_name_arg, in_memory=in_memory)
             
             if not path:
                 return None
@@ -292,7 +313,7 @@ class ReplicationManager:
                     caption=caption, 
                     caption_entities=entities, 
                     reply_to_message_id=reply_to,
-                    file_name=original_file_name or os.path.basename(path)
+                    file_name=original_file_name or os.path.basename(getattr(path, "name", path))
                 )
             elif getattr(message, "audio", None):
                 sent = await self.user.send_audio(target_chat, path, caption=caption, caption_entities=entities, duration=message.audio.duration, reply_to_message_id=reply_to)
@@ -312,8 +333,8 @@ class ReplicationManager:
         except Exception as e:
             LOGGER(__name__).error(f"Bypass failed for {source_chat}/{message.id}: {e}")
         finally:
-            # Cleanup
-            if path and os.path.exists(path):
+            # Cleanup (in-memory downloads leave nothing on disk)
+            if isinstance(path, str) and os.path.exists(path):
                 try:
                     os.remove(path)
                 except:
@@ -394,6 +415,16 @@ class ReplicationManager:
                 text = self._rewrite_links(text, source_chat, target_chat)
                 
             entities = message.caption_entities if message.caption else message.entities
+
+            # Every file_id send from a protected source fails; skip that round-trip
+            if (
+                (message.has_protected_content or source_chat in self._protected_sources)
+                and get_media_size(message) is not None
+            ):
+                sent_id = await self._bypass_restriction(source_chat, target_chat, message, caption, reply_to_msg_id)
+                if sent_id:
+                    self.store.set_mapping(source_chat, message.id, target_chat, sent_id)
+                return sent_id
             
             sent = None
             
@@ -612,12 +643,14 @@ class ReplicationManager:
                     return sent_id
                     
         except FloodWait as e:
-            await asyncio.sleep(e.value + 1)
+            await asyncio.sleep(backoff_delay(e.value, retry_count))
             if retry_count < 3:
                 return await self._copy_message(source_chat, target_chat, message, retry_count + 1)
         except Exception as e:
             # Check for restriction errors
             err_str = str(e).upper()
+            if "CHAT_FORWARDS_RESTRICTED" in err_str:
+                self._protected_sources.add(source_chat)
             if "CHAT_FORWARDS_RESTRICTED" in err_str or "FILEREF" in err_str or "MEDIA_CAPTION_TOO_LONG" in err_str or "WEBPAGE_CURL_FAILED" in err_str:
                 LOGGER(__name__).warning(f"Restriction detected ({e}), attempting bypass logic...")
                 # Prepare caption with link rewriting (already done above but strictly pass it)
@@ -681,20 +714,15 @@ class ReplicationManager:
         
         LOGGER(__name__).info(f"Starting backfill {source_chat} -> {target_chat} from msg #{last_synced + 1}")
         
+        # Memory-efficient: process in batches instead of loading all messages
+        processed_count = 0
+        total_estimated = 0
+
+        last_progress = 0.0
+        progress_task = None
+
         try:
-            # Memory-efficient: process in batches instead of loading all messages
-            processed_count = 0
-            total_estimated = 0
-            
-            # First, get a rough count by fetching a small sample
-            sample_msgs = []
-            async for msg in self.user.get_chat_history(source_chat, limit=1):
-                if msg.id > last_synced:
-                    total_estimated = msg.id - last_synced
-                break
-            
-            LOGGER(__name__).info(f"Estimated ~{total_estimated} messages to process")
-            
+
             # Process in reverse order (oldest first) using offset
             offset = 0
             while True:
@@ -708,6 +736,12 @@ class ReplicationManager:
                 if not batch:
                     break
                 
+                # History is newest-first, so the first page already carries the
+                # latest id; no separate limit=1 probe is needed for the estimate
+                if offset == 0:
+                    total_estimated = batch[0].id - last_synced
+                    LOGGER(__name__).info(f"Estimated ~{total_estimated} messages to process")
+                
                 # Sort batch by message ID (oldest first)
                 batch.sort(key=lambda m: m.id)
                 
@@ -734,11 +768,16 @@ class ReplicationManager:
                         stats["failed"] += 1
                         LOGGER(__name__).error(f"Backfill failed for {msg.id}: {e}")
                     
-                    if progress_callback:
-                        try:
-                            await progress_callback(processed_count, total_estimated, stats)
-                        except Exception:
-                            pass
+                    # Progress is fired off the hot path, at most once per PROGRESS_INTERVAL,
+                    # and skipped while the previous update is still in flight
+                    now = time()
+                    if progress_callback and now - last_progress >= PROGRESS_INTERVAL and (
+                        progress_task is None or progress_task.done()
+                    ):
+                        last_progress = now
+                        progress_task = asyncio.create_task(
+                            _safe_progress(progress_callback, processed_count, total_estimated, dict(stats))
+                        )
                     
                     # Rate limiting - be gentle to avoid floodwait
                     await asyncio.sleep(1.5)
@@ -753,6 +792,13 @@ class ReplicationManager:
         except Exception as e:
             LOGGER(__name__).error(f"Backfill error: {e}")
         
+        # The time gate may have swallowed the last messages, so always report
+        # the final counts once the in-flight update has landed
+        if progress_task is not None:
+            await progress_task
+        if progress_callback and processed_count:
+            await _safe_progress(progress_callback, processed_count, total_estimated, dict(stats))
+
         # Clear media group cache after backfill
         self._media_group_cache.clear()
         
@@ -4,7 +4,7 @@ from PIL import Image
 from logger import LOGGER
 from typing import Optional
 from asyncio.subprocess import PIPE
-from asyncio import create_subprocess_exec, create_subprocess_shell, wait_for
+from asyncio import create_subprocess_exec, create_subprocess_shell, to_thread, wait_for
 
 from pyleaves import Leaves
 from pyrogram.parser import Parser
@@ -18,7 +18,7 @@ from pyrogram.types import (
 
 from helpers.files import (
     fileSizeLimit,
-    cleanup_download
+    cleanup_downloads
 )
 
 from helpers.msg import (
@@ -338,14 +338,12 @@ async def processMediaGroup(chat_message, bot, message):
             await progress_message.delete()
 
         # Cleanup all temporary and invalid downloaded files
-        for path in temp_paths + invalid_paths:
-            cleanup_download(path)
+        await to_thread(cleanup_downloads, temp_paths + invalid_paths)
 
         return True
 
     # No valid media found, inform user and cleanup invalid paths
     await progress_message.delete()
     await message.reply("❌ No valid media found in the media group.")
-    for path in invalid_paths:
-        cleanup_download(path)
+    await to_thread(cleanup_downloads, invalid_paths)
     return False
@@ -3,6 +3,7 @@ import shutil
 import psutil
 import asyncio
 from time import time
+from typing import Optional
 
 from pyleaves import Leaves
 from pyrogram.enums import ParseMode
@@ -17,7 +18,7 @@ from helpers.channel import ChannelCloner
 from helpers.forwarding import ForwardingManager, normalize_identifier
 from helpers.mirroring import MirrorManager
 from helpers.replication import ReplicationManager
-from helpers.external import is_supported_url, extract_supported_url
+from helpers.external import is_supported_url, extract_supported_url, forget_cookiefile
 from helpers.external_handler import handle_external
 
 from helpers.config_store import (
@@ -183,6 +184,23 @@ def _decrypt_cookies_if_present():
 _decrypt_cookies_if_present()
 
 
+def _install_uvloop():
+    """Switch to uvloop before any Client grabs an event loop, if enabled and available."""
+    if not PyroConf.USE_UVLOOP:
+        return
+    try:
+        import uvloop
+    except ImportError:
+        LOGGER(__name__).info("uvloop not installed; using the default asyncio event loop.")
+        return
+    # Same effect as uvloop.install(), which is deprecated on Python 3.12+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    LOGGER(__name__).info("Using uvloop event loop.")
+
+
+_install_uvloop()
+
+
 # Initialize bot and user clients
 bot = Client(
     "media_bot",
@@ -191,19 +209,30 @@ bot = Client(
     bot_token=PyroConf.BOT_TOKEN,
     workers=1000,
     parse_mode=ParseMode.MARKDOWN,
+    max_concurrent_transmissions=PyroConf.MAX_CONCURRENT_TRANSMISSIONS,
 )
 
 user = Client(
     "user_session",
     workers=1000,
     session_string=PyroConf.SESSION_STRING,
+    max_concurrent_transmissions=PyroConf.MAX_CONCURRENT_TRANSMISSIONS,
 )
 
 # Initialize channel cloner
-channel_cloner = ChannelCloner(user, bot, delay=1.0)
+channel_cloner = ChannelCloner(
+    user,
+    bot,
+    concurrency=PyroConf.CLONE_CONCURRENCY,
+    rate=PyroConf.CLONE_RATE,
+    chat_rate=PyroConf.CLONE_CHAT_RATE,
+    download_concurrency=PyroConf.CLONE_DOWNLOAD_WORKERS,
+    upload_concurrency=PyroConf.CLONE_UPLOAD_WORKERS,
+    in_memory_max_bytes=PyroConf.IN_MEMORY_MAX_MB * 1024**2,
+)
 forwarding_manager = ForwardingManager(user)
 mirror_manager = MirrorManager(user, channel_cloner)
-replication_manager = ReplicationManager(user)
+replication_manager = ReplicationManager(user, in_memory_max_bytes=PyroConf.IN_MEMORY_MAX_MB * 1024**2)
 
 RUNNING_TASKS = set()
 
@@ -886,22 +915,25 @@ async def set_cookies(_, message: Message):
     dest = os.path.join("cookies", "cookies.txt")
     try:
         await message.reply_to_message.download(dest)
+        forget_cookiefile()
         await message.reply("✅ Cookies stored. Future external downloads will use them (until dyno restart).")
     except Exception as e:
         await message.reply(f"❌ Failed to store cookies: {e}")
 
 
-async def handle_download(bot: Client, message: Message, post_url: str):
+async def handle_download(bot: Client, message: Message, post_url: str, chat_message: Optional[Message] = None):
     post_url = post_url.split("?", 1)[0]
 
     try:
         chat_id, message_id = getChatMsgID(post_url)
-        result = await user.get_messages(chat_id=chat_id, message_ids=message_id)
-        
-        if isinstance(result, list):
-            chat_message = result[0] if result else None
-        else:
-            chat_message = result
+        # /bdl has already fetched the post; only single /dl requests need the round-trip
+        if chat_message is None:
+            result = await user.get_messages(chat_id=chat_id, message_ids=message_id)
+
+            if isinstance(result, list):
+                chat_message = result[0] if result else None
+            else:
+                chat_message = result
         
         if not chat_message:
             await message.reply("**❌ Message not found or unable to access.**")
@@ -918,9 +950,6 @@ async def handle_download(bot: Client, message: Message, post_url: str):
             if not await fileSizeLimit(file_size, message, "download", getattr(user.me, 'is_premium', False)):
                 return
 
-        parsed_caption = await get_parsed_msg(chat_message.caption or "", chat_message.caption_entities)
-        parsed_text = await get_parsed_msg(chat_message.text or "", chat_message.entities)
-
         if chat_message.media_group_id:
             success = await processMediaGroup(chat_message, bot, message)
             if not success:
@@ -949,13 +978,17 @@ async def handle_download(bot: Client, message: Message, post_url: str):
                 "document"
             )
 
+            parsed_caption = await get_parsed_msg(chat_message.caption or "", chat_message.caption_entities)
             await send_media(bot, message, media_path, media_type, parsed_caption, progress_message, start_time)
 
-            cleanup_download(media_path)
+            await asyncio.to_thread(cleanup_download, media_path)
             await progress_message.delete()
 
         elif chat_message.text or chat_message.caption:
-            await message.reply(parsed_text or parsed_caption)
+            await message.reply(
+                chat_message.text or chat_message.caption,
+                entities=chat_message.entities or chat_message.caption_entities,
+            )
         else:
             await message.reply("**No media or text found in the post URL.**")
 
@@ -986,6 +1019,10 @@ async def download_media(bot: Client, message: Message):
     await track_task(handle_download(bot, message, post_url))
 
 
+# Post ids fetched per get_messages call in /bdl
+BDL_FETCH_BATCH = 100
+
+
 @bot.on_message(filters.command("bdl") & filters.private)
 async def download_range(bot: Client, message: Message):
     args = message.text.split()
@@ -1023,17 +1060,20 @@ async def download_range(bot: Client, message: Message):
 
     downloaded = skipped = failed = 0
 
-    for msg_id in range(start_id, end_id + 1):
-        url = f"{prefix}/{msg_id}"
+    # Fetch ids in batches so deleted posts cost neither a request nor the pause
+    for batch_start in range(start_id, end_id + 1, BDL_FETCH_BATCH):
+        batch_ids = list(range(batch_start, min(batch_start + BDL_FETCH_BATCH, end_id + 1)))
         try:
-            result = await user.get_messages(chat_id=start_chat, message_ids=msg_id)
-            
-            if isinstance(result, list):
-                chat_msg = result[0] if result else None
-            else:
-                chat_msg = result
-                
-            if not chat_msg:
+            batch = await user.get_messages(chat_id=start_chat, message_ids=batch_ids)
+        except Exception as e:
+            failed += len(batch_ids)
+            LOGGER(__name__).error(f"Error fetching {prefix}/{batch_ids[0]}-{batch_ids[-1]}: {e}")
+            continue
+        if not isinstance(batch, list):
+            batch = [batch]
+
+        for chat_msg in batch:
+            if not chat_msg or getattr(chat_msg, "empty", False):
                 skipped += 1
                 continue
 
@@ -1043,20 +1083,22 @@ async def download_range(bot: Client, message: Message):
                 skipped += 1
                 continue
 
-            task = track_task(handle_download(bot, message, url))
+            url = f"{prefix}/{chat_msg.id}"
             try:
-                await task
-                downloaded += 1
-            except asyncio.CancelledError:
-                await loading.delete()
-                await message.reply(f"**❌ Batch canceled after downloading `{downloaded}` posts.**")
-                return
+                task = track_task(handle_download(bot, message, url, chat_msg))
+                try:
+                    await task
+                    downloaded += 1
+                except asyncio.CancelledError:
+                    await loading.delete()
+                    await message.reply(f"**❌ Batch canceled after downloading `{downloaded}` posts.**")
+                    return
 
-        except Exception as e:
-            failed += 1
-            LOGGER(__name__).error(f"Error at {url}: {e}")
+            except Exception as e:
+                failed += 1
+                LOGGER(__name__).error(f"Error at {url}: {e}")
 
-        await asyncio.sleep(3)
+            await asyncio.sleep(3)
 
     await loading.delete()
     await message.reply(
@@ -1122,30 +1164,6 @@ async def cancel_all_tasks(_, message: Message):
     await message.reply(f"**Cancelled {cancelled} running task(s).**")
 
 
-def get_source_channel_ids():
-    """Parse SOURCE_CHANNELS config to get list of channel IDs/usernames"""
-    if not PyroConf.SOURCE_CHANNELS:
-        return []
-    return [ch.strip() for ch in PyroConf.SOURCE_CHANNELS.split(",") if ch.strip()]
-
-
-async def forward_message_to_destination(message: Message):
-    """Forward a message to the destination channel"""
-    if not PyroConf.DESTINATION_CHANNEL:
-        LOGGER(__name__).warning("No destination channel configured")
-        return
-        
-    try:
-        await user.forward_messages(
-            chat_id=PyroConf.DESTINATION_CHANNEL,
-            from_chat_id=message.chat.id,
-            message_ids=message.id
-        )
-        LOGGER(__name__).info(f"Forwarded message {message.id} from {message.chat.id} to {PyroConf.DESTINATION_CHANNEL}")
-    except Exception as e:
-        LOGGER(__name__).error(f"Failed to forward message: {e}")
-
-
 @user.on_message(filters.channel)
 async def handle_channel_message(client: Client, message: Message):
     """Handle new messages from monitored channels (modular manager)."""
@@ -1284,13 +1302,16 @@ async def manage_mirroring(_, message: Message):
 async def clone_full_channel(bot: Client, message: Message):
     """Clone an entire channel from source to target."""
     args = message.text.split()
+    # Newest N messages only; history paging stops once they are read
+    limit = int(args[3]) if len(args) == 4 and args[3].isdecimal() else None
     
-    if len(args) != 3:
+    if len(args) not in (3, 4) or (len(args) == 4 and (limit is None or limit < 1)):
         await message.reply(
             "🔄 **Channel Cloning** (Media Only)\n\n"
-            "**Usage:** `/clone_channel <source> <target>`\n\n"
+            "**Usage:** `/clone_channel <source> <target> [count]`\n\n"
             "**Examples:**\n"
             "• `/clone_channel @sourcechannel @targetchannel`\n"
+            "• `/clone_channel @sourcechannel @targetchannel 500` (newest 500 only, count ≥ 1)\n"
             "• `/clone_channel sourcechannel targetchannel`\n"
             "• `/clone_channel https://t.me/sourcechannel https://t.me/targetchannel`\n\n"
             "**Target can be:**\n"
@@ -1308,16 +1329,8 @@ async def clone_full_channel(bot: Client, message: Message):
     source_channel = args[1]
     target_channel = args[2]
     
-    def normalize_channel(channel_str):
-        channel = channel_str.strip()
-        if channel.startswith("https://t.me/"):
-            channel = channel.rstrip("/").rsplit("/", 1)[-1]
-        elif channel.startswith('@'):
-            channel = channel[1:]
-        return channel
-    
-    source_channel = normalize_channel(source_channel)
-    target_channel = normalize_channel(target_channel)
+    source_channel = normalize_identifier(source_channel)
+    target_channel = normalize_identifier(target_channel)
     
     keyboard = InlineKeyboardMarkup([
         [InlineKeyboardButton("Cancel", callback_data="cancel"), InlineKeyboardButton("Status", callback_data="status")]
@@ -1337,31 +1350,31 @@ async def clone_full_channel(bot: Client, message: Message):
             f"✅ **Validated Successfully!**\n\n"
             f"**Source:** {source_info['title']} ({source_info.get('type_description', 'Channel')})\n"
             f"**Target:** {target_info['title']} ({target_info.get('type_description', 'Channel')})\n\n"
-            f"🚀 **Starting full channel clone...**\n"
+            f"🚀 **Starting {f'clone of the newest {limit} messages' if limit else 'full channel clone'}...**\n"
             f"This may take a while depending on channel size.", reply_markup=keyboard
         )
         
         async def progress_callback(current_id, start_id, end_id, stats):
-            if current_id % 50 == 0:
-                progress_text = (
-                    f"📊 **Cloning Progress**\n\n"
-                    f"**Current Message:** {current_id}\n"
-                    f"**Range:** {start_id} - {end_id}\n\n"
-                    f"✅ **Copied:** {stats['successful']}\n"
-                    f"❌ **Failed:** {stats['failed']}\n"
-                    f"⏭️ **Skipped:** {stats['skipped']}\n"
-                    f"📈 **Total Processed:** {stats['total']}\n"
-                )
-                try:
-                    await status_msg.edit(progress_text, reply_markup=keyboard)
-                except:
-                    pass
+            progress_text = (
+                f"📊 **Cloning Progress**\n\n"
+                f"**Current Message:** {current_id}\n"
+                f"**Range:** {start_id} - {end_id}\n\n"
+                f"✅ **Copied:** {stats['successful']}\n"
+                f"❌ **Failed:** {stats['failed']}\n"
+                f"⏭️ **Skipped:** {stats['skipped']}\n"
+                f"📈 **Total Processed:** {stats['total']}\n"
+            )
+            try:
+                await status_msg.edit(progress_text, reply_markup=keyboard)
+            except:
+                pass
         
         stats = await channel_cloner.clone_channel_messages(
             source_channel,
             target_channel,
             progress_callback=progress_callback,
             progress_message=status_msg,
+            limit=limit,
         )
         
         final_text = (
@@ -1415,16 +1428,8 @@ async def clone_range_messages(bot: Client, message: Message):
         await message.reply("❌ **Start ID cannot be greater than end ID.**")
         return
     
-    def normalize_channel(channel_str):
-        channel = channel_str.strip()
-        if channel.startswith("https://t.me/"):
-            channel = channel.rstrip("/").rsplit("/", 1)[-1]
-        elif channel.startswith('@'):
-            channel = channel[1:]
-        return channel
-    
-    source_channel = normalize_channel(source_channel)
-    target_channel = normalize_channel(target_channel)
+    source_channel = normalize_identifier(source_channel)
+    target_channel = normalize_identifier(target_channel)
     
     keyboard = InlineKeyboardMarkup([
         [InlineKeyboardButton("Cancel", callback_data="cancel"), InlineKeyboardButton("Status", callback_data="status")]
@@ -1450,18 +1455,17 @@ async def clone_range_messages(bot: Client, message: Message):
         )
         
         async def progress_callback(current_id, start_id_p, end_id_p, stats):
-            if current_id % 20 == 0:
-                progress_text = (
-                    f"📊 **Range Clone Progress**\n\n"
-                    f"**Current:** {current_id}/{end_id_p}\n"
-                    f"✅ **Copied:** {stats['successful']}\n"
-                    f"❌ **Failed:** {stats['failed']}\n"
-                    f"⏭️ **Skipped:** {stats['skipped']}\n"
-                )
-                try:
-                    await status_msg.edit(progress_text, reply_markup=keyboard)
-                except:
-                    pass
+            progress_text = (
+                f"📊 **Range Clone Progress**\n\n"
+                f"**Current:** {current_id}/{end_id_p}\n"
+                f"✅ **Copied:** {stats['successful']}\n"
+                f"❌ **Failed:** {stats['failed']}\n"
+                f"⏭️ **Skipped:** {stats['skipped']}\n"
+            )
+            try:
+                await status_msg.edit(progress_text, reply_markup=keyboard)
+            except:
+                pass
         
         stats = await channel_cloner.clone_channel_messages(
             source_channel,
@@ -1936,17 +1940,16 @@ async def manage_replication(_, message: Message):
                 target = int(args[3])
                 
                 async def progress_cb(current, total, stats):
-                    if current % 20 == 0 or current == total:
-                        try:
-                            await status_msg.edit(
-                                f"📊 **Backfill Progress**\n\n"
-                                f"**Progress:** {current}/{total}\n"
-                                f"✅ **Cloned:** {stats['cloned']}\n"
-                                f"⏭️ **Skipped:** {stats['skipped']}\n"
-                                f"❌ **Failed:** {stats['failed']}"
-                            )
-                        except Exception:
-                            pass
+                    try:
+                        await status_msg.edit(
+                            f"📊 **Backfill Progress**\n\n"
+                            f"**Progress:** {current}/{total}\n"
+                            f"✅ **Cloned:** {stats['cloned']}\n"
+                            f"⏭️ **Skipped:** {stats['skipped']}\n"
+                            f"❌ **Failed:** {stats['failed']}"
+                        )
+                    except Exception:
+                        pass
                 
                 stats = await replication_manager.backfill(source, target, progress_callback=progress_cb)
                 await status_msg.edit(
@@ -2019,7 +2022,8 @@ async def manage_replication(_, message: Message):
                 title = getattr(chat, "title", "Unknown")
                 username = getattr(chat, "username", None)
                 members = getattr(chat, "members_count", "N/A")
-                chat_type = str(getattr(chat, "type", "Unknown"))
+                # ChatType.SUPERGROUP -> "Supergroup" rather than the enum repr
+                chat_type = chat.type.name.title() if getattr(chat, "type", None) else "Unknown"
                 
                 await message.reply(
                     f"📡 **Channel Info**\n━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
@@ -2065,4 +2069,5 @@ if __name__ == "__main__":
         LOGGER(__name__).error(err)
     finally:
         replication_manager.stop_all_backfills()
+        channel_cloner.close()
         LOGGER(__name__).info("Bot Stopped")
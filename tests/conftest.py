@@ -0,0 +1,5 @@
+import os
+
+# config.py exits at import without these; the helpers under test never use them
+os.environ.setdefault("BOT_TOKEN", "123456:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef1234")
+os.environ.setdefault("SESSION_STRING", "test-session")
@@ -0,0 +1,175 @@
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyrogram")
+pytest.importorskip("pyleaves")
+pytest.importorskip("PIL")
+
+from pyrogram.enums import MessageMediaType
+
+from helpers.channel import ChannelCloner, _normalize_channel_identifier
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ("@name", "name"),
+    (" @name ", "name"),
+    ("name", "name"),
+    ("https://t.me/name", "name"),
+    ("t.me/name/", "name"),
+    ("www.t.me/name", "name"),
+    ("http://www.t.me/s/name", "name"),
+    ("-1001234567890", -1001234567890),
+    ("https://t.me/+AbC123", "https://t.me/+AbC123"),
+    ("https://t.me/joinchat/AbC123", "https://t.me/joinchat/AbC123"),
+])
+def test_normalize_channel_identifier(raw, expected):
+    assert _normalize_channel_identifier(raw) == expected
+
+
+@pytest.fixture
+def cloner():
+    c = ChannelCloner(None, None)
+    yield c
+    c.close()
+
+
+def test_album_copy_runs_once_and_is_forgotten(cloner):
+    calls = []
+
+    async def copy():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["m1", "m2", "m3"]
+
+    async def run():
+        return await asyncio.gather(*[
+            cloner._once_per_album(("s", 1, "d"), copy, members=len) for _ in range(3)
+        ])
+
+    assert asyncio.run(run()) == [["m1", "m2", "m3"]] * 3
+    assert len(calls) == 1
+    assert cloner._group_copies == {}
+
+
+def test_failed_album_copy_is_retried(cloner):
+    calls = []
+
+    async def copy():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("flood")
+        return ["m1"]
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cloner._once_per_album(("s", 1, "d"), copy, members=len)
+        return await cloner._once_per_album(("s", 1, "d"), copy, members=len)
+
+    assert asyncio.run(run()) == ["m1"]
+    assert len(calls) == 2
+    assert cloner._group_copies == {}
+
+
+def test_reupload_album_counts_only_members_that_are_copied(cloner):
+    async def download(**kwargs):
+        return BytesIO(b"x")
+
+    photo = SimpleNamespace(id=1, media=MessageMediaType.PHOTO, photo=SimpleNamespace(file_size=1),
+                            media_group_id=7, download=download)
+    voice = SimpleNamespace(id=2, media=MessageMediaType.VOICE, voice=SimpleNamespace(file_size=1),
+                            media_group_id=7, download=download)
+
+    async def get_media_group(chat_id, message_id):
+        return [photo, voice]
+
+    async def upload(target, msg, path, converted, **kwargs):
+        return SimpleNamespace(id=99)
+
+    cloner.user = SimpleNamespace(get_media_group=get_media_group)
+    cloner._upload_media = upload
+
+    async def run():
+        # The voice member is skipped before it reaches the shared call
+        return await cloner._once_per_album(
+            ("s", 7, "d", "reupload"),
+            lambda: cloner._download_and_reupload_album("s", "d", photo),
+            members=lambda result: result[1],
+        )
+
+    assert asyncio.run(run()) == (99, 1)
+    assert cloner._group_copies == {}
+
+
+def _page_msg(msg_id, bulk=True):
+    return SimpleNamespace(id=msg_id, media=MessageMediaType.PHOTO, bulk=bulk, text=None, caption=None)
+
+
+def _fake_pipeline(cloner, monkeypatch, tmp_path, pages, failing_batches=()):
+    """Route clone_channel_messages through in-memory pages and recording copy calls."""
+    monkeypatch.chdir(tmp_path)
+    calls = {"bulk": [], "single": []}
+
+    async def resolve(ident):
+        return ident
+
+    async def history(src, limit=None):
+        for page in pages:
+            yield page
+
+    async def copy_bulk(src, dst, msgs):
+        ids = [m.id for m in msgs]
+        calls["bulk"].append(ids)
+        return ids not in failing_batches
+
+    async def copy_single(src, dst, mid, progress_message=None, **kwargs):
+        calls["single"].append(mid)
+        return True
+
+    cloner._resolve_chat_id = resolve
+    cloner._history_pages = history
+    cloner._copy_bulk = copy_bulk
+    cloner._copy_single_message = copy_single
+    cloner._bulk_copyable = lambda msg: msg.bulk
+    return calls
+
+
+def test_clone_bulk_copies_runs_and_queues_the_rest(cloner, monkeypatch, tmp_path):
+    page = [_page_msg(1), _page_msg(2), _page_msg(3, bulk=False), _page_msg(4), _page_msg(5)]
+    calls = _fake_pipeline(cloner, monkeypatch, tmp_path, [page])
+
+    stats = asyncio.run(cloner.clone_channel_messages("s", "d"))
+
+    assert calls["bulk"] == [[1, 2], [4, 5]]
+    assert calls["single"] == [3]
+    assert stats == {"successful": 5, "failed": 0, "skipped": 0, "total": 5}
+    # A clean run leaves no resume state behind
+    assert not (tmp_path / ".clone_state_s_d.json").exists()
+
+
+def test_failed_bulk_batch_queues_its_leftovers(cloner, monkeypatch, tmp_path):
+    monkeypatch.setattr("helpers.channel.COPY_BATCH_SIZE", 2)
+    page = [_page_msg(i) for i in range(1, 6)] + [_page_msg(6, bulk=False), _page_msg(7)]
+    calls = _fake_pipeline(cloner, monkeypatch, tmp_path, [page], failing_batches=[[3, 4]])
+
+    stats = asyncio.run(cloner.clone_channel_messages("s", "d"))
+
+    # [1, 2] went through; the failed [3, 4] and the unsent [5] fall back to the
+    # workers, and bulk copying stays off for the rest of the page
+    assert calls["bulk"] == [[1, 2], [3, 4]]
+    assert sorted(calls["single"]) == [3, 4, 5, 6, 7]
+    assert stats["successful"] == 7 and stats["failed"] == 0
+
+
+def test_clone_resumes_from_saved_state(cloner, monkeypatch, tmp_path):
+    (tmp_path / ".clone_state_s_d.json").write_text("[1, 3]")
+    page = [_page_msg(1), _page_msg(2), _page_msg(3, bulk=False), _page_msg(4, bulk=False)]
+    calls = _fake_pipeline(cloner, monkeypatch, tmp_path, [page])
+
+    stats = asyncio.run(cloner.clone_channel_messages("s", "d"))
+
+    assert calls["bulk"] == [[2]]
+    assert calls["single"] == [4]
+    assert stats["skipped"] == 2 and stats["successful"] == 2
@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from helpers import config_store
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_store, "CONFIG_PATH", str(tmp_path / "runtime_config.json"))
+    monkeypatch.setattr(config_store, "_CACHE", None)
+    monkeypatch.setattr(config_store, "_flush_handle", None)
+    # Environment forwarding settings seed the defaults; keep them out of the way
+    monkeypatch.setattr(config_store.PyroConf, "SOURCE_CHANNELS", "")
+    monkeypatch.setattr(config_store.PyroConf, "DESTINATION_CHANNEL", "")
+    monkeypatch.setattr(config_store.PyroConf, "FORWARD_ENABLED", False)
+    return tmp_path / "runtime_config.json"
+
+
+def _on_disk(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_sources_and_targets_keep_order_without_duplicates(store):
+    for src in ("b", "a", "b"):
+        config_store.add_source_channel(src)
+    config_store.add_mirror_rule("s", ["x", "y", "x"])
+    cfg = config_store.load_config()
+    assert cfg["source_channels"] == ["b", "a"]
+    assert cfg["mirror_rules"] == {"s": ["x", "y"]}
+    assert _on_disk(store)["source_channels"] == ["b", "a"]
+    assert _on_disk(store)["mirror_rules"] == {"s": ["x", "y"]}
+
+
+def test_load_config_returns_a_copy():
+    config_store.add_source_channel("a")
+    cfg = config_store.load_config()
+    cfg["source_channels"].append("b")
+    cfg["mirror_rules"]["s"] = ["x"]
+    assert config_store.load_config()["source_channels"] == ["a"]
+    assert config_store.load_config()["mirror_rules"] == {}
+
+
+def test_defaults_come_from_environment_settings(monkeypatch):
+    monkeypatch.setattr(config_store.PyroConf, "SOURCE_CHANNELS", "@c1, c2,,")
+    monkeypatch.setattr(config_store.PyroConf, "DESTINATION_CHANNEL", " @dest ")
+    monkeypatch.setattr(config_store.PyroConf, "FORWARD_ENABLED", True)
+    cfg = config_store.load_config()
+    assert cfg["source_channels"] == ["c1", "c2"]
+    assert cfg["destination_channel"] == "@dest"
+    assert cfg["forward_enabled"] is True
+
+
+def test_existing_file_round_trips(store):
+    store.write_text(json.dumps({
+        "forward_enabled": True,
+        "source_channels": ["c1", "c2"],
+        "mirror_rules": {"s": ["t1", "t2"]},
+    }), encoding="utf-8")
+    cfg = config_store.load_config()
+    assert cfg["forward_enabled"] is True
+    assert cfg["source_channels"] == ["c1", "c2"]
+    config_store.remove_source_channel("c1")
+    assert _on_disk(store)["source_channels"] == ["c2"]
+    assert _on_disk(store)["mirror_rules"] == {"s": ["t1", "t2"]}
+
+
+def test_writes_immediately_without_a_loop(store):
+    config_store.set_target_channel(" @dest ")
+    assert _on_disk(store)["destination_channel"] == "@dest"
+    assert not (store.parent / "runtime_config.json.tmp").exists()
+
+
+def test_mutations_on_a_loop_share_one_write(store, monkeypatch):
+    writes = []
+    real_replace = config_store.os.replace
+
+    def counting_replace(src, dst):
+        writes.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(config_store.os, "replace", counting_replace)
+
+    async def run():
+        config_store.add_source_channel("a")
+        config_store.add_source_channel("b")
+        config_store.set_forward_enabled(True)
+        assert not store.exists()
+        await asyncio.sleep(config_store.FLUSH_DELAY * 3)
+
+    asyncio.run(run())
+    assert writes == [str(store)]
+    assert _on_disk(store)["source_channels"] == ["a", "b"]
+    assert _on_disk(store)["forward_enabled"] is True
+
+
+def test_flush_config_writes_pending_change(store):
+    async def run():
+        config_store.set_mirror_enabled(True)
+        config_store.flush_config()
+        return _on_disk(store)["mirror_enabled"]
+
+    assert asyncio.run(run()) is True
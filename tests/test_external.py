@@ -0,0 +1,42 @@
+import pytest
+
+from helpers.external import _cookiefile, _declares_audio, _is_final_error, forget_cookiefile
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("ERROR: [youtube] abc: Video unavailable", True),
+    ("ERROR: [youtube] abc: Private video. Sign in if you've been granted access", True),
+    ("ERROR: [youtube] abc: Sign in to confirm you're not a bot", True),
+    ("ERROR: unable to download video data: HTTP Error 403: Forbidden", True),
+    ("ERROR: Unsupported URL: https://example.com", True),
+    ("ERROR: [pinterest] 123: Requested format is not available", False),
+    ("ERROR: Postprocessing: Conversion failed!", False),
+])
+def test_is_final_error(message, expected):
+    assert _is_final_error(message) is expected
+
+
+@pytest.mark.parametrize("info,expected", [
+    ({"acodec": "mp4a.40.2"}, True),
+    ({"acodec": "none"}, False),
+    ({}, False),
+    ({"acodec": "none", "requested_formats": [{"acodec": "none"}, {"acodec": "opus"}]}, True),
+    ({"requested_formats": [{"acodec": "none"}, {"vcodec": "avc1"}]}, False),
+])
+def test_declares_audio(info, expected):
+    assert _declares_audio(info) is expected
+
+
+def test_uploaded_cookies_are_picked_up_after_forget(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for var in ("YTDLP_COOKIES_FILE", "YTDLP_COOKIES_B64", "ENCRYPTED_COOKIES"):
+        monkeypatch.delenv(var, raising=False)
+    forget_cookiefile()
+    try:
+        assert _cookiefile() is None
+        (tmp_path / "cookies").mkdir()
+        (tmp_path / "cookies" / "cookies.txt").write_text("# Netscape HTTP Cookie File\n")
+        forget_cookiefile()
+        assert _cookiefile() == "cookies/cookies.txt"
+    finally:
+        forget_cookiefile()
@@ -0,0 +1,77 @@
+import asyncio
+from time import monotonic
+
+from helpers.ratelimit import TokenBucket, backoff_delay
+
+
+def test_bucket_allows_initial_burst():
+    async def run():
+        bucket = TokenBucket(rate=10, capacity=5)
+        start = monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return monotonic() - start
+
+    assert asyncio.run(run()) < 0.05
+
+
+def test_bucket_paces_after_burst():
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return monotonic() - start
+
+    # First token is free, the next two refill at 20/s
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_penalize_and_recover():
+    bucket = TokenBucket(rate=30, recover_after=2)
+    bucket.penalize()
+    assert bucket.rate == 24
+    for _ in range(2):
+        bucket.reward()
+    assert bucket.rate == 27
+    for _ in range(10):
+        bucket.reward()
+    assert bucket.rate == 30
+
+
+def test_penalize_respects_min_rate():
+    bucket = TokenBucket(rate=1, min_rate=0.5)
+    for _ in range(10):
+        bucket.penalize()
+    assert bucket.rate == 0.5
+
+
+def test_drain_blocks_until_wait_elapsed():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=5)
+        bucket.drain(0.1)
+        start = monotonic()
+        await bucket.acquire()
+        return monotonic() - start
+
+    assert asyncio.run(run()) >= 0.1
+
+
+def test_overlapping_drains_do_not_stack():
+    bucket = TokenBucket(rate=10)
+    bucket.drain(2)
+    bucket.drain(1)
+    assert bucket._tokens <= -19
+    assert bucket._tokens > -21
+
+
+def test_backoff_delay_grows_and_is_capped():
+    for attempt in range(5):
+        delay = backoff_delay(10, attempt)
+        assert 10 <= delay <= 10 + 0.5 * 2 ** attempt
+    assert 299 <= backoff_delay(299, 20) <= 599
+
+
+def test_backoff_delay_never_undercuts_long_waits():
+    for attempt in range(30):
+        assert 1000 <= backoff_delay(1000, attempt) <= 1300
@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyrogram")
+
+from helpers import replication
+from helpers.replication import ReplicationManager
+
+
+class _FakeUser:
+    def __init__(self, ids):
+        self.ids = ids
+
+    async def get_chat_history(self, chat_id, limit, offset=0):
+        for msg_id in sorted(self.ids, reverse=True)[offset:offset + limit]:
+            yield SimpleNamespace(id=msg_id)
+
+
+def test_backfill_progress_is_throttled_and_always_final(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(replication.asyncio, "sleep", lambda _: real_sleep(0))
+
+    manager = ReplicationManager(_FakeUser(range(1, 6)))
+
+    async def copy(source, target, msg):
+        return True
+
+    monkeypatch.setattr(manager, "_copy_message", copy)
+    calls = []
+
+    async def progress(current, total, stats):
+        calls.append((current, total, stats["cloned"]))
+
+    stats = asyncio.run(manager.backfill(-1, -2, start_id=1, progress_callback=progress))
+
+    assert stats["cloned"] == 5
+    # One update from the first message, then the time gate holds until the final report
+    assert calls == [(1, 5, 1), (5, 5, 5)]
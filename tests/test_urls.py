@@ -16,6 +16,7 @@ def test_is_supported_url(url, expected):
     ("Check this https://youtu.be/xyz great", "https://youtu.be/xyz"),
     ("Leading (https://www.youtube.com/watch?v=abc).", "https://www.youtube.com/watch?v=abc"),
     ("Multiple https://instagram.com/p/123 and https://pin.it/abcd", "https://instagram.com/p/123"),
+    ("First https://pin.it/abcd then https://youtu.be/xyz", "https://pin.it/abcd"),
     ("No links here", None),
 ])
 def test_extract_supported_url(text, expected_part):
@@ -24,3 +25,11 @@ def test_extract_supported_url(text, expected_part):
         assert result is None
     else:
         assert result is not None and result.startswith(expected_part)
+
+@pytest.mark.parametrize("text,expected", [
+    ("see https://youtu.be/xyz.", "https://youtu.be/xyz"),
+    ('quoted "https://www.instagram.com/p/1/", ok', "https://www.instagram.com/p/1/"),
+    ("[https://pin.it/abcd]", "https://pin.it/abcd"),
+])
+def test_extract_stops_at_wrapping_punctuation(text, expected):
+    assert extract_supported_url(text) == expected